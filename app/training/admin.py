@@ -8,3 +8,4 @@ admin.site.register(models.MuscleGroup)
 admin.site.register(models.Workout)
 admin.site.register(models.ExerciseSet)
 admin.site.register(models.Set)
+admin.site.register(models.PersonalRecord)
@@ -0,0 +1,26 @@
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Sum
+
+from training.models import Set
+
+
+def exercise_volume(user, date_from=None, date_to=None):
+    """
+    Aggregate total volume (reps x weight), set count and max weight
+    per exercise and weight unit of user in the database
+    """
+    queryset = Set.objects.filter(user=user)
+    if date_from:
+        queryset = queryset.filter(exercise__workout__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(exercise__workout__date__lte=date_to)
+
+    return queryset.values(
+                'exercise__exercise_id', 'exercise__exercise__name', 'weight_unit'
+    ).annotate(
+        volume=Sum(ExpressionWrapper(
+            F('reps') * F('weight'),
+            output_field=DecimalField(max_digits=30, decimal_places=2)
+        )),
+        set_count=Count('id'),
+        max_weight=Max('weight'),
+    ).order_by('exercise__exercise__name', 'weight_unit')
@@ -0,0 +1,257 @@
+import datetime
+import math
+from contextlib import contextmanager
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+                        CaptureQueriesContext,
+                        override_settings,
+                        setup_test_environment,
+                        teardown_test_environment,
+                    )
+from django.urls import reverse
+
+from training.caching import invalidate_catalog
+from training.models import Exercise, ExerciseSet, Set, Workout
+from training.records import rebuild
+from training.utils import bulk_create_with_pks
+
+
+PASSWORD = 'benchmark-password'
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, percent):
+    """
+    Return nearest rank percentile of sorted values
+    """
+    if not values:
+        return None
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+@contextmanager
+def test_environment():
+    """
+    Allow test client host and keep outgoing mail in memory,
+    unless already set up by test runner. Auth throttling is turned
+    off as every simulated user shares one address
+    """
+    with override_settings(AUTH_THROTTLE_RATES={}):
+        try:
+            setup_test_environment()
+        except RuntimeError:
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            teardown_test_environment()
+
+
+def seed(users=10, workouts=50, exercise_sets=3, sets=4, exercises=20, random_seed=0):
+    """
+    Create verified users with workout histories over shared exercise
+    catalog, returns created users. Data is generated from random_seed
+    so runs are reproducible
+    """
+    rng = random.Random(random_seed)
+    catalog = bulk_create_with_pks(Exercise, [
+        Exercise(name=f'Benchmark exercise {index}') for index in range(exercises)
+    ])
+    # bulk insert doesn't send the signals rebuilding catalog snapshot
+    invalidate_catalog()
+    # hashing is slow, every user shares the same password
+    password = make_password(PASSWORD)
+    created = bulk_create_with_pks(get_user_model(), [
+        get_user_model()(
+            email=f'benchmark{index}@benchmark.com',
+            username=f'benchmark{index}',
+            password=password,
+            is_verified=True,
+        )
+        for index in range(users)
+    ])
+
+    for user in created:
+        user_workouts = bulk_create_with_pks(Workout, [
+            Workout(user=user, date=datetime.date(2021, 1, 1) + datetime.timedelta(days=day))
+            for day in range(workouts)
+        ])
+        user_exercise_sets = bulk_create_with_pks(ExerciseSet, [
+            ExerciseSet(user=user, workout=workout, exercise=rng.choice(catalog))
+            for workout in user_workouts
+            for _ in range(exercise_sets)
+        ])
+        Set.objects.bulk_create([
+            Set(
+                user=user,
+                exercise=exercise_set,
+                reps=rng.randint(1, 12),
+                weight=Decimal(rng.randint(20, 200)),
+            )
+            for exercise_set in user_exercise_sets
+            for _ in range(sets)
+        ], batch_size=1000)
+
+    rebuild(created)
+    return created
+
+
+class UserSession:
+    """
+    Test client logged in as seeded user with ids of its objects
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.client = Client()
+        self.workout = Workout.objects.filter(user=user).first()
+        self.exercise_set = ExerciseSet.objects.filter(user=user).first()
+        self.set = Set.objects.filter(user=user).first()
+        self.day = 0
+
+    def login(self):
+        # token of previous round is deleted by logout
+        self.client.defaults.pop('HTTP_AUTHORIZATION', None)
+        response = self.client.post(
+                        reverse('user:login'),
+                        {'email': self.user.email, 'password': PASSWORD}
+        )
+        token = response.json().get('token') or response.json().get('access')
+        prefix = 'Token' if 'token' in response.json() else 'Bearer'
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'{prefix} {token}'
+        return response
+
+    def next_date(self):
+        # one new workout date per create request
+        self.day += 1
+        return (datetime.date(2030, 1, 1) + datetime.timedelta(days=self.day)).isoformat()
+
+
+# name, method, url and payload of every benchmarked request
+ENDPOINTS = (
+    ('user:me', 'get', lambda session: reverse('user:me'), None),
+    ('training:workout-list', 'get', lambda session: reverse('training:workout-list'), None),
+    (
+        'training:workout-detail', 'get',
+        lambda session: reverse('training:workout-detail', args=[session.workout.id]), None
+    ),
+    (
+        'training:workout-create', 'post', lambda session: reverse('training:workout-list'),
+        lambda session: {'date': session.next_date()}
+    ),
+    (
+        'training:workout-create-tree', 'post', lambda session: reverse('training:workout-create-tree'),
+        lambda session: {
+            'date': session.next_date(),
+            'exerciseset': [{
+                'exercise': session.exercise_set.exercise_id,
+                'set': [{'reps': 5, 'weight': '100.00'}] * 3,
+            }],
+        }
+    ),
+    ('training:exerciseset-list', 'get', lambda session: reverse('training:exerciseset-list'), None),
+    (
+        'training:exerciseset-detail', 'get',
+        lambda session: reverse('training:exerciseset-detail', args=[session.exercise_set.id]), None
+    ),
+    ('training:set-list', 'get', lambda session: reverse('training:set-list'), None),
+    (
+        'training:set-detail', 'get',
+        lambda session: reverse('training:set-detail', args=[session.set.id]), None
+    ),
+    (
+        'training:set-create', 'post', lambda session: reverse('training:set-list'),
+        lambda session: {'exercise': session.exercise_set.id, 'reps': 5, 'weight': '100.00'}
+    ),
+    (
+        'training:set-bulk-create', 'post', lambda session: reverse('training:set-list'),
+        lambda session: [{'exercise': session.exercise_set.id, 'reps': 5, 'weight': '100.00'}] * 10
+    ),
+    ('training:analytics-volume', 'get', lambda session: reverse('training:analytics-volume'), None),
+    ('training:records', 'get', lambda session: reverse('training:records'), None),
+    ('training:exercise-list', 'get', lambda session: reverse('training:exercise-list'), None),
+    (
+        'training:exercise-search', 'get',
+        lambda session: reverse('training:exercise-search') + '?q=bench', None
+    ),
+    ('training:export', 'get', lambda session: reverse('training:export'), None),
+)
+
+
+class Benchmark:
+    """
+    Drive user and training endpoints with test client as seeded
+    users and collect latency and query count of every request
+    """
+
+    def __init__(self, users, iterations=5):
+        self.sessions = [UserSession(user) for user in users]
+        self.iterations = iterations
+        self.samples = {}
+
+    def measure(self, name, request):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = request()
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+
+        self.samples.setdefault(name, []).append(
+            (elapsed, len(queries.captured_queries), response.status_code)
+        )
+
+    def run(self):
+        for iteration in range(self.iterations):
+            for index, session in enumerate(self.sessions):
+                self.measure('user:register', lambda: Client().post(reverse('user:register'), {
+                    'email': f'register{iteration}-{index}@benchmark.com',
+                    'username': 'register',
+                    'password': PASSWORD,
+                }))
+                self.measure('user:login', session.login)
+                for name, method, url, payload in ENDPOINTS:
+                    data = payload(session) if payload else None
+                    request = getattr(session.client, method)
+                    self.measure(
+                        name,
+                        lambda: request(url(session), data, content_type='application/json')
+                                if method == 'post' else request(url(session))
+                    )
+                self.measure('user:logout', lambda: session.client.get(reverse('user:logout')))
+
+        return self.results()
+
+    def results(self):
+        endpoints = {}
+        for name, samples in self.samples.items():
+            latencies = sorted(elapsed for elapsed, queries, status in samples)
+            queries = [queries for elapsed, queries, status in samples]
+            statuses = {}
+            for elapsed, queries_count, status in samples:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+            endpoints[name] = {
+                'requests': len(samples),
+                **{
+                    f'p{percent}_ms': round(percentile(latencies, percent) * 1000, 3)
+                    for percent in PERCENTILES
+                },
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+                'throughput_rps': round(len(latencies) / sum(latencies), 1),
+                'queries_min': min(queries),
+                'queries_max': max(queries),
+                'queries_mean': round(sum(queries) / len(queries), 2),
+                'statuses': statuses,
+            }
+
+        return endpoints
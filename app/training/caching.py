@@ -0,0 +1,85 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def generation_key(user_id):
+    return f'training:generation:{user_id}'
+
+
+def get_counter(key):
+    """
+    Return value of version counter stored in cache
+    """
+    value = cache.get(key)
+    if value is None:
+        # start from current time so a counter evicted from cache
+        # never restarts at a value that older entries were stored with
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key)
+
+    return value
+
+
+def bump_counter(key):
+    """
+    Move version counter stored in cache to a new value
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_counter(key)
+
+
+def get_generation(user_id):
+    """
+    Return current cache generation of user training data
+    """
+    return get_counter(generation_key(user_id))
+
+
+def bump_generation(user_id):
+    """
+    Move user to a new generation making all cached responses unreachable
+    """
+    bump_counter(generation_key(user_id))
+
+
+def invalidate_user(user_id):
+    """
+    Invalidate cached training responses of user
+    """
+    bump_generation(user_id)
+    # bump again after commit so responses cached by concurrent
+    # requests before the transaction committed are dropped as well
+    transaction.on_commit(lambda: bump_generation(user_id))
+
+
+def response_cache_key(user_id, url):
+    """
+    Return cache key of response for url in current user generation
+    """
+    url_hash = hashlib.md5(url.encode()).hexdigest()
+    return f'training:response:{user_id}:{get_generation(user_id)}:{url_hash}'
+
+
+CATALOG_VERSION_KEY = 'training:catalog:version'
+
+
+def get_catalog_version():
+    """
+    Return current version of exercise and muscle group catalog
+    """
+    return get_counter(CATALOG_VERSION_KEY)
+
+
+def invalidate_catalog():
+    """
+    Make every process rebuild its catalog snapshot
+    """
+    bump_counter(CATALOG_VERSION_KEY)
+    # snapshot built from uncommitted data's predecessor by another
+    # process before commit is dropped by the second bump
+    transaction.on_commit(lambda: bump_counter(CATALOG_VERSION_KEY))
@@ -0,0 +1,88 @@
+import threading
+
+from django.utils.functional import cached_property
+
+from training.caching import get_catalog_version
+from training.models import Exercise, MuscleGroup
+from training.search import ExerciseSearchIndex
+
+
+class CatalogSnapshot:
+    """
+    Immutable representation of exercise and muscle group
+    catalog at given version
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.muscle_groups = list(
+            MuscleGroup.objects.order_by('id').values('id', 'name', 'description')
+        )
+
+        muscles = {}
+        through = Exercise.muscles.through.objects.order_by('exercise_id', 'musclegroup_id')
+        for exercise_id, muscle_group_id in through.values_list('exercise_id', 'musclegroup_id'):
+            muscles.setdefault(exercise_id, []).append(muscle_group_id)
+        self.exercises = [
+            dict(exercise, muscles=muscles.get(exercise['id'], []))
+            for exercise in Exercise.objects.order_by('id').values('id', 'name', 'description')
+        ]
+
+        self.exercises_by_id = {exercise['id']: exercise for exercise in self.exercises}
+        self.muscle_groups_by_id = {
+            muscle_group['id']: muscle_group for muscle_group in self.muscle_groups
+        }
+
+    @cached_property
+    def search_index(self):
+        """
+        Exercise search index built on first search of this snapshot
+        """
+        return ExerciseSearchIndex(self.exercises, self.muscle_groups_by_id)
+
+    def search_exercises(self, q, limit=10, muscles=False):
+        return [
+            self.exercises_by_id[exercise_id]
+            for exercise_id in self.search_index.search(q, limit, muscles)
+        ]
+
+    def exercise_name(self, exercise_id):
+        exercise = self.exercises_by_id.get(exercise_id)
+        if exercise is None:
+            # created after snapshot was taken by this request
+            return Exercise.objects.filter(pk=exercise_id).values_list('name', flat=True).first()
+        return exercise['name']
+
+
+class Catalog:
+    """
+    Thread safe process wide catalog snapshot, rebuilt when
+    catalog version shared by all processes through cache changes
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        version = get_catalog_version()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != version:
+            with self._lock:
+                if self._snapshot is None or self._snapshot.version != version:
+                    self._snapshot = CatalogSnapshot(version)
+                snapshot = self._snapshot
+
+        return snapshot
+
+
+catalog = Catalog()
+
+
+def context_snapshot(context):
+    """
+    Return catalog snapshot shared by serializers of one request
+    """
+    if 'catalog' not in context:
+        context['catalog'] = catalog.snapshot()
+    return context['catalog']
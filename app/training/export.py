@@ -0,0 +1,97 @@
+import csv
+import datetime
+import json
+from decimal import Decimal
+
+from training.models import Workout
+
+
+# output name and lookup from Workout of every exported column
+EXPORT_COLUMNS = (
+    ('workout', 'id'),
+    ('date', 'date'),
+    ('exerciseset', 'exerciseset__id'),
+    ('exercise', 'exerciseset__exercise__name'),
+    ('set', 'exerciseset__set__id'),
+    ('reps', 'exerciseset__set__reps'),
+    ('reps_unit', 'exerciseset__set__reps_unit'),
+    ('weight', 'exerciseset__set__weight'),
+    ('weight_unit', 'exerciseset__set__weight_unit'),
+    ('rest', 'exerciseset__set__rest'),
+    ('rest_unit', 'exerciseset__set__rest_unit'),
+)
+EXPORT_HEADER = tuple(name for name, lookup in EXPORT_COLUMNS)
+
+CHUNK_SIZE = 2000
+
+
+def export_value(value):
+    """
+    Convert exported value to JSON and CSV friendly type
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def export_rows(user, chunk_size=CHUNK_SIZE):
+    """
+    Yield one row per set of user training history, workouts and exercise
+    sets without sets are exported with empty set columns. Rows are read
+    with a chunked iterator so memory doesn't grow with history size
+    """
+    queryset = Workout.objects.filter(user=user).order_by(
+                    'date', 'id', 'exerciseset__id', 'exerciseset__set__id'
+    ).values_list(*(lookup for name, lookup in EXPORT_COLUMNS))
+
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield tuple(export_value(value) for value in row)
+
+
+def batched(lines, size=CHUNK_SIZE):
+    """
+    Join generated lines into batches to keep number of writes low
+    """
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def ndjson_stream(user):
+    """
+    Stream training history as newline delimited JSON
+    """
+    return batched(
+        json.dumps(dict(zip(EXPORT_HEADER, row))) + '\n'
+        for row in export_rows(user)
+    )
+
+
+class Echo:
+    """
+    Pseudo buffer returning what is written instead of storing it
+    """
+    def write(self, value):
+        return value
+
+
+def csv_stream(user):
+    """
+    Stream training history as CSV with header row
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    yield from batched(writer.writerow(row) for row in export_rows(user))
+
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_stream, 'application/x-ndjson'),
+    'csv': (csv_stream, 'text/csv'),
+}
@@ -0,0 +1,108 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer
+
+
+def parse_paths(value):
+    """
+    Parse comma separated dotted paths into set of tuples
+    """
+    return {
+        tuple(path.strip().split('.'))
+        for path in value.split(',') if path.strip()
+    }
+
+
+class FieldSelection:
+    """
+    Fields and nested levels of serializer tree requested with
+    ?fields=id,date,exerciseset.exercise and ?expand=exerciseset.set,
+    without parameters the whole tree is selected
+    """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = parse_paths(fields) if fields else None
+        self.expand = None
+        if expand is not None:
+            # expanding a nested level expands its parents as well
+            self.expand = {
+                path[:length]
+                for path in parse_paths(expand)
+                for length in range(1, len(path) + 1)
+            }
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Build selection from query parameters of read requests,
+        writes always use the whole serializer
+        """
+        if request is None or request.method not in SAFE_METHODS:
+            return cls()
+        return cls(request.query_params.get('fields'), request.query_params.get('expand'))
+
+    def field_allowed(self, path, name):
+        """
+        Check if field name of serializer at path is requested
+        """
+        if self.fields is None:
+            return True
+        depth = len(path)
+        requested = {
+            field[depth] for field in self.fields
+            if len(field) > depth and field[:depth] == path
+        }
+        # no field requested at this level selects all of them
+        return not requested or name in requested
+
+    def includes(self, path):
+        """
+        Check if nested serializer at path is requested
+        """
+        for depth in range(1, len(path) + 1):
+            if not self.field_allowed(path[:depth - 1], path[depth - 1]):
+                return False
+        return self.expand is None or path in self.expand
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin returning only fields and nested levels
+    selected by FieldSelection in serializer context, nested
+    serializers that are not selected are never built
+    """
+
+    @property
+    def field_path(self):
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        return tuple(reversed(path))
+
+    @property
+    def field_selection(self):
+        return self.context.get('field_selection') or FieldSelection()
+
+    def is_selected(self, name):
+        path = self.field_path
+        nested = isinstance(type(self)._declared_fields.get(name), BaseSerializer)
+        if nested:
+            return self.field_selection.includes(path + (name,))
+        return self.field_selection.field_allowed(path, name)
+
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        return [name for name in names if self.is_selected(name)]
+
+    def get_fields(self):
+        # shadow class declared fields so unselected ones aren't copied
+        self._declared_fields = {
+            name: field for name, field in type(self)._declared_fields.items()
+            if self.is_selected(name)
+        }
+        try:
+            return super().get_fields()
+        finally:
+            del self._declared_fields
@@ -0,0 +1,36 @@
+from django.db.models import Q
+
+from rest_framework.filters import BaseFilterBackend
+
+
+def lookup_filter(lookup, value, request):
+    """
+    Build Q for lookup given as field lookup string or as
+    function of query parameter value and request returning Q
+    """
+    if callable(lookup):
+        return lookup(value, request)
+    return Q(**{lookup: value})
+
+
+class QueryParamsFilter(BaseFilterBackend):
+    """
+    Filter queryset by query parameters validated with view
+    filter_serializer_class and mapped to lookups in view filter_lookups
+    """
+
+    def get_filters(self, request, view):
+        serializer_class = getattr(view, 'filter_serializer_class', None)
+        if serializer_class is None:
+            return {}
+
+        serializer = serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return [
+            lookup_filter(view.filter_lookups[param], value, request)
+            for param, value in serializer.validated_data.items()
+        ]
+
+    def filter_queryset(self, request, queryset, view):
+        return queryset.filter(*self.get_filters(request, view))
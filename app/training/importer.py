@@ -0,0 +1,217 @@
+import codecs
+import csv
+import json
+
+from django.db import transaction
+
+from rest_framework import serializers
+
+from training.constants import REPS_UNIT_CHOICES, WEIGHT_UNIT_CHOICES, REST_UNIT_CHOICES
+from training.models import Workout, Exercise, ExerciseSet, Set
+from training.utils import bulk_create_with_pks
+from training.caching import invalidate_user
+from training.records import record_sets
+
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+SET_FIELDS = ('reps', 'reps_unit', 'weight', 'weight_unit', 'rest', 'rest_unit')
+
+
+class ImportRowSerializer(serializers.Serializer):
+    """
+    Serializer validating one row of imported training history,
+    rows use the same columns as training.export
+    """
+    workout = serializers.CharField(required=False)
+    date = serializers.DateField()
+    exerciseset = serializers.CharField(required=False)
+    exercise = serializers.CharField(required=False, max_length=100)
+    reps = serializers.IntegerField(required=False, min_value=0)
+    reps_unit = serializers.ChoiceField(choices=REPS_UNIT_CHOICES.choices(), required=False)
+    weight = serializers.DecimalField(required=False, max_digits=20, decimal_places=2)
+    weight_unit = serializers.ChoiceField(choices=WEIGHT_UNIT_CHOICES.choices(), required=False)
+    rest = serializers.IntegerField(required=False, min_value=0)
+    rest_unit = serializers.ChoiceField(choices=REST_UNIT_CHOICES.choices(), required=False)
+
+    def validate_exercise(self, value):
+        exercise_id = self.context['exercises'].get(value.strip().lower())
+        if exercise_id is None:
+            raise serializers.ValidationError(f'Unknown exercise "{value}".')
+        return exercise_id
+
+    def validate(self, attrs):
+        has_set = any(field in attrs for field in SET_FIELDS)
+        if has_set and 'exercise' not in attrs:
+            raise serializers.ValidationError('Set requires an exercise.')
+        if has_set and 'weight' not in attrs:
+            raise serializers.ValidationError('Set requires a weight.')
+        return attrs
+
+
+def parse_csv(lines):
+    """
+    Yield (line number, row) for every row of CSV lines with header
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def parse_ndjson(lines):
+    """
+    Yield (line number, row) for every JSON object of NDJSON lines,
+    malformed lines are yielded as None
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+IMPORT_FORMATS = {
+    'csv': parse_csv,
+    'ndjson': parse_ndjson,
+}
+
+
+def text_lines(binary_file):
+    """
+    Decode uploaded or opened binary file lazily line by line
+    """
+    return codecs.iterdecode(binary_file, 'utf-8')
+
+
+def import_format(name, default='csv'):
+    """
+    Return import format for explicit type or file name extension
+    """
+    return name.rsplit('.', 1)[-1].lower() if name else default
+
+
+class TrainingImporter:
+    """
+    Import training history rows of user, rows are validated and
+    written in batches, each batch in its own transaction
+    """
+
+    def __init__(self, user, batch_size=BATCH_SIZE, progress=None):
+        self.user = user
+        self.batch_size = batch_size
+        self.progress = progress
+        # exercise catalog is resolved once for the whole import
+        self.exercises = {
+            name.strip().lower(): pk
+            for pk, name in Exercise.objects.values_list('id', 'name')
+        }
+        # primary keys of objects created by earlier batches
+        self.workouts = {}
+        self.exercise_sets = {}
+        self.result = {
+            'rows': 0,
+            'workouts': 0,
+            'exercisesets': 0,
+            'sets': 0,
+            'error_count': 0,
+            'errors': [],
+        }
+
+    def add_error(self, line_number, errors):
+        self.result['error_count'] += 1
+        if len(self.result['errors']) < MAX_REPORTED_ERRORS:
+            self.result['errors'].append({'line': line_number, 'errors': errors})
+
+    def validate_batch(self, batch):
+        """
+        Validate batch of parsed rows, returning rows that are valid
+        """
+        valid = []
+        context = {'exercises': self.exercises}
+        for line_number, row in batch:
+            if row is None:
+                self.add_error(line_number, {'non_field_errors': ['Malformed row.']})
+                continue
+            data = {key: value for key, value in row.items() if value not in ('', None)}
+            serializer = ImportRowSerializer(data=data, context=context)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                self.add_error(line_number, serializer.errors)
+        return valid
+
+    def write_batch(self, rows):
+        """
+        Write workouts, exercise sets and sets of rows with
+        one bulk insert per model
+        """
+        workouts = {}
+        exercise_sets = {}
+        for row in rows:
+            workout_key = row.get('workout', row['date'].isoformat())
+            row['workout_key'] = workout_key
+            if workout_key not in self.workouts and workout_key not in workouts:
+                workouts[workout_key] = Workout(user=self.user, date=row['date'])
+            if 'exercise' in row:
+                exercise_set_key = (workout_key, row.get('exerciseset', row['exercise']))
+                row['exercise_set_key'] = exercise_set_key
+                if exercise_set_key not in self.exercise_sets and exercise_set_key not in exercise_sets:
+                    exercise_sets[exercise_set_key] = (workout_key, row['exercise'])
+
+        with transaction.atomic():
+            bulk_create_with_pks(Workout, list(workouts.values()))
+            self.workouts.update({key: workout.pk for key, workout in workouts.items()})
+
+            created = bulk_create_with_pks(ExerciseSet, [
+                ExerciseSet(user=self.user, workout_id=self.workouts[workout_key], exercise_id=exercise_id)
+                for workout_key, exercise_id in exercise_sets.values()
+            ])
+            self.exercise_sets.update({key: obj.pk for key, obj in zip(exercise_sets, created)})
+
+            sets = bulk_create_with_pks(Set, [
+                Set(
+                    user=self.user,
+                    exercise_id=self.exercise_sets[row['exercise_set_key']],
+                    **{field: row[field] for field in SET_FIELDS if field in row}
+                )
+                for row in rows if 'weight' in row
+            ])
+            # bulk_create doesn't send signals invalidating cached responses,
+            # touching workouts of earlier batches and updating personal records
+            invalidate_user(self.user.id)
+            Workout.objects.filter(pk__in={
+                self.workouts[row['workout_key']] for row in rows
+                if 'exercise_set_key' in row and row['workout_key'] not in workouts
+            }).touch()
+            record_sets(sets)
+
+        self.result['workouts'] += len(workouts)
+        self.result['exercisesets'] += len(created)
+        self.result['sets'] += len(sets)
+
+    def process_batch(self, batch):
+        self.result['rows'] += len(batch)
+        rows = self.validate_batch(batch)
+        if rows:
+            self.write_batch(rows)
+        if self.progress:
+            self.progress(self.result)
+
+    def run(self, parsed_rows):
+        """
+        Import (line number, row) pairs produced by one of IMPORT_FORMATS
+        """
+        batch = []
+        for parsed_row in parsed_rows:
+            batch.append(parsed_row)
+            if len(batch) >= self.batch_size:
+                self.process_batch(batch)
+                batch = []
+        if batch:
+            self.process_batch(batch)
+
+        return self.result
@@ -0,0 +1,74 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from training.benchmark import Benchmark, seed, test_environment
+
+
+class Command(BaseCommand):
+    """
+    Load test user and training endpoints on seeded data
+    """
+    help = (
+        'Seed users with workout histories, drive every endpoint through test client '
+        'and save latency percentiles, throughput and query counts as JSON, '
+        'seeded data is rolled back afterwards'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--workouts', type=int, default=50, help='Workouts per user')
+        parser.add_argument('--iterations', type=int, default=5, help='Rounds over all endpoints per user')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed of generated data')
+        parser.add_argument('--output', default='benchmark.json', help='Path of JSON results')
+        parser.add_argument('--compare', help='Path of JSON results of previous run')
+
+    def handle(self, *args, **options):
+        with test_environment(), transaction.atomic():
+            users = seed(
+                users=options['users'],
+                workouts=options['workouts'],
+                random_seed=options['seed']
+            )
+            endpoints = Benchmark(users, iterations=options['iterations']).run()
+            transaction.set_rollback(True)
+
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'users': options['users'],
+            'workouts': options['workouts'],
+            'iterations': options['iterations'],
+            'seed': options['seed'],
+            'endpoints': endpoints,
+        }
+        with open(options['output'], 'w') as output:
+            json.dump(results, output, indent=2)
+
+        previous = {}
+        if options['compare']:
+            with open(options['compare']) as previous_file:
+                previous = json.load(previous_file)['endpoints']
+
+        self.stdout.write(
+            f"{'endpoint':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'req/s':>10}{'queries':>9}{'p50 diff':>10}"
+        )
+        for name, result in endpoints.items():
+            diff = ''
+            if name in previous:
+                diff = f"{(result['p50_ms'] / previous[name]['p50_ms'] - 1) * 100:+.0f}%"
+            self.stdout.write(
+                f"{name:<32}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}"
+                f"{result['throughput_rps']:>10}{result['queries_max']:>9}{diff:>10}"
+            )
+
+            failed = sum(
+                count for status, count in result['statuses'].items() if int(status) >= 400
+            )
+            if failed:
+                self.stderr.write(f'{name}: {failed} requests failed')
+
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {options['output']}."))
@@ -0,0 +1,110 @@
+import datetime
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from training.models import Exercise, ExerciseSet, Set, Workout
+from training.serializers import SetSerializer, ExerciseSetSerializer
+from training.utils import bulk_create_with_pks
+from training.values import SetValuesSerializer, ExerciseSetValuesSerializer
+
+
+SETS_PER_EXERCISESET = 10
+EXERCISESETS_PER_WORKOUT = 10
+
+
+class Command(BaseCommand):
+    """
+    Compare model serializers with their .values() fast read path
+    """
+    help = 'Benchmark set and exercise set serializers on seeded data, rolled back afterwards'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,10000,100000',
+            help='Comma separated numbers of sets to seed'
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per path, best is reported')
+
+    def seed(self, size):
+        """
+        Create user with size sets, returns the user
+        """
+        user = get_user_model().objects.create_user(email='benchmark@benchmark.com')
+        exercise = Exercise.objects.create(name='Benchmark')
+
+        exercise_sets_count = max(1, size // SETS_PER_EXERCISESET)
+        workouts = bulk_create_with_pks(Workout, [
+            Workout(user=user, date=datetime.date(2021, 1, 1) + datetime.timedelta(days=day))
+            for day in range(max(1, exercise_sets_count // EXERCISESETS_PER_WORKOUT))
+        ])
+        exercise_sets = bulk_create_with_pks(ExerciseSet, [
+            ExerciseSet(user=user, workout=workouts[index % len(workouts)], exercise=exercise)
+            for index in range(exercise_sets_count)
+        ])
+        Set.objects.bulk_create([
+            Set(
+                user=user,
+                exercise=exercise_sets[index % len(exercise_sets)],
+                reps=index % 12 + 1,
+                weight=f'{20 + index % 100}.5',
+            )
+            for index in range(size)
+        ], batch_size=1000)
+
+        return user
+
+    def best_time(self, serialize, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = serialize()
+            timings.append(time.perf_counter() - start)
+        return min(timings), data
+
+    def compare(self, name, rows, model_path, values_path, repeat):
+        model_time, model_data = self.best_time(model_path, repeat)
+        values_time, values_data = self.best_time(values_path, repeat)
+        if model_data != values_data:
+            raise CommandError(f'{name} fast path output differs from model serializer')
+
+        self.stdout.write(
+            f'{name:<12}{rows:>10}{model_time * 1000:>14.1f}'
+            f'{values_time * 1000:>14.1f}{model_time / values_time:>10.1f}x'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        repeat = options['repeat']
+
+        self.stdout.write(f"{'serializer':<12}{'rows':>10}{'model ms':>14}{'values ms':>14}{'speedup':>11}")
+        for size in sizes:
+            with transaction.atomic():
+                user = self.seed(size)
+                sets = Set.objects.filter(user=user)
+                exercise_sets = ExerciseSet.objects.filter(user=user)
+
+                set_values = SetValuesSerializer()
+                self.compare(
+                    'Set', size,
+                    lambda: SetSerializer(sets.all(), many=True).data,
+                    lambda: set_values.to_representation(set_values.values(sets.all())),
+                    repeat
+                )
+
+                exercise_set_values = ExerciseSetValuesSerializer()
+                self.compare(
+                    'ExerciseSet', exercise_sets.count(),
+                    lambda: ExerciseSetSerializer(
+                        exercise_sets.select_related('workout').prefetch_related('set'),
+                        many=True
+                    ).data,
+                    lambda: exercise_set_values.to_representation(
+                        exercise_set_values.values(exercise_sets.all())
+                    ),
+                    repeat
+                )
+
+                transaction.set_rollback(True)
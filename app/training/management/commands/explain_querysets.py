@@ -0,0 +1,105 @@
+import datetime
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Prefetch
+
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from training import views
+from training.filters import lookup_filter
+
+
+# sqlite: "SCAN training_set" without "USING ... INDEX", postgresql: "Seq Scan on"
+FULL_SCAN_PATTERNS = (
+    re.compile(r'\bSCAN (?:TABLE )?\w+\s*$', re.MULTILINE),
+    re.compile(r'\bSeq Scan on\b'),
+)
+
+VIEWSETS = (views.WorkoutView, views.ExerciseSetView, views.SetView)
+
+# values used to explain querysets filtered by query parameters
+SAMPLE_VALUES = (
+    (serializers.DateField, datetime.date(2021, 1, 1)),
+    (serializers.IntegerField, 0),
+)
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN on every training viewset list queryset
+    and fail if any of them does a full table scan
+    """
+    help = 'Explain training viewset querysets and fail on full table scans'
+
+    def get_request(self):
+        """
+        Request of a regular user
+        """
+        request = Request(APIRequestFactory().get('/'))
+        request.user = get_user_model()(pk=0)
+        return request
+
+    def get_list_queryset(self, viewset, request):
+        """
+        Build queryset exactly as viewset list action does for request user
+        """
+        view = viewset(request=request, action='list', format_kwarg=None, kwargs={})
+        return view.get_queryset().order_by(*view.paginator.ordering)
+
+    def get_filtered_querysets(self, viewset, queryset, request):
+        """
+        Build list queryset filtered by each supported query parameter
+        """
+        if viewset.filter_serializer_class is None:
+            return
+        fields = viewset.filter_serializer_class().fields
+        for param, lookup in viewset.filter_lookups.items():
+            value = next(
+                value for field_class, value in SAMPLE_VALUES
+                if isinstance(fields[param], field_class)
+            )
+            yield f'{viewset.__name__}?{param}', queryset.filter(lookup_filter(lookup, value, request))
+
+    def get_prefetch_querysets(self, queryset):
+        """
+        Build querysets run for prefetch lookups of parent queryset
+        """
+        model = queryset.model
+        for lookup in queryset._prefetch_related_lookups:
+            if not isinstance(lookup, Prefetch):
+                lookup = Prefetch(lookup)
+            relation = model._meta.get_field(lookup.prefetch_through)
+            prefetch_queryset = lookup.queryset
+            if prefetch_queryset is None:
+                prefetch_queryset = relation.related_model._default_manager.all()
+            prefetch_queryset = prefetch_queryset.filter(
+                                    **{f'{relation.field.name}__in': [0]}
+            )
+            yield f'{model.__name__}.{lookup.prefetch_to}', prefetch_queryset
+            yield from self.get_prefetch_querysets(prefetch_queryset)
+
+    def handle(self, *args, **options):
+        full_scans = []
+        request = self.get_request()
+        for viewset in VIEWSETS:
+            queryset = self.get_list_queryset(viewset, request)
+            page_size = viewset.pagination_class.page_size
+            querysets = [(viewset.__name__, queryset)]
+            querysets.extend(self.get_filtered_querysets(viewset, queryset, request))
+            # list querysets are explained for a single page
+            querysets = [(name, queryset[:page_size]) for name, queryset in querysets]
+            querysets.extend(self.get_prefetch_querysets(queryset))
+            for name, queryset in querysets:
+                plan = queryset.explain()
+                self.stdout.write(f'{name}:\n{plan}\n')
+                if any(pattern.search(plan) for pattern in FULL_SCAN_PATTERNS):
+                    full_scans.append(name)
+
+        if full_scans:
+            raise CommandError(f"Full table scan in: {', '.join(full_scans)}")
+
+        self.stdout.write(self.style.SUCCESS('No full table scans found.'))
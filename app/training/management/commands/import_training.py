@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from training.importer import (
+                        TrainingImporter,
+                        IMPORT_FORMATS,
+                        BATCH_SIZE,
+                        import_format,
+                        text_lines,
+                      )
+
+
+class Command(BaseCommand):
+    """
+    Import training history of user from NDJSON or CSV file
+    """
+    help = 'Import training history of user from NDJSON or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='Email of user owning imported history')
+        parser.add_argument('path', help='Path of CSV or NDJSON file')
+        parser.add_argument('--type', choices=IMPORT_FORMATS, help='Defaults to file extension')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def report_progress(self, result):
+        self.stdout.write(
+            f"{result['rows']} rows processed, {result['sets']} sets created, "
+            f"{result['error_count']} errors"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options['email'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['email']} does not exist.")
+
+        import_type = options['type'] or import_format(options['path'])
+        if import_type not in IMPORT_FORMATS:
+            raise CommandError(f"Unknown import type {import_type}, use --type.")
+
+        importer = TrainingImporter(
+                        user,
+                        batch_size=options['batch_size'],
+                        progress=self.report_progress
+        )
+        with open(options['path'], 'rb') as import_file:
+            result = importer.run(IMPORT_FORMATS[import_type](text_lines(import_file)))
+
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['workouts']} workouts, {result['exercisesets']} "
+            f"exercise sets and {result['sets']} sets."
+        ))
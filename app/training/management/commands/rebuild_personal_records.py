@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from training.records import rebuild
+
+
+class Command(BaseCommand):
+    """
+    Rebuild personal records table from sets
+    """
+    help = 'Rebuild personal records of all or selected users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='emails', help='Email of user, repeatable')
+
+    def handle(self, *args, **options):
+        users = None
+        if options['emails']:
+            users = get_user_model().objects.filter(email__in=options['emails'])
+
+        count = rebuild(users)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} personal records.'))
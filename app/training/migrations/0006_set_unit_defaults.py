@@ -0,0 +1,34 @@
+# Generated by Django 3.1.14 on 2026-10-18 09:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0005_auto_20210413_1339'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exerciseset',
+            name='workout',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exerciseset', to='training.workout'),
+        ),
+        migrations.AlterField(
+            model_name='set',
+            name='reps_unit',
+            field=models.CharField(choices=[('REPS', 'Repetitions'), ('MIN', 'Minutes'), ('SEC', 'Seconds'), ('KM', 'Kilometers')], default='REPS', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='set',
+            name='rest_unit',
+            field=models.CharField(choices=[('SEC', 'seconds'), ('MIN', 'Minutes'), ('HR', 'Hours')], default='MIN', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='set',
+            name='weight_unit',
+            field=models.CharField(choices=[('KG', 'Kilograms'), ('BW', 'Body weight'), ('KH', 'Kilometers per hour')], default='KG', max_length=20),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.1.14 on 2026-10-18 09:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0006_set_unit_defaults'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='exerciseset',
+            options={'ordering': ('id',)},
+        ),
+        migrations.AlterModelOptions(
+            name='set',
+            options={'ordering': ('id',)},
+        ),
+        migrations.AlterModelOptions(
+            name='workout',
+            options={'ordering': ('-date', '-id')},
+        ),
+        migrations.AddIndex(
+            model_name='exerciseset',
+            index=models.Index(fields=['user', 'exercise'], name='exerciseset_user_exercise_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='set',
+            index=models.Index(fields=['user', 'exercise'], name='set_user_exercise_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', 'date', 'id'], name='workout_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.1.14 on 2026-10-18 09:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0007_user_access_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workout',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', 'updated_at'], name='workout_user_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.1.14 on 2026-10-18 09:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('training', '0008_workout_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonalRecord',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('best_weight', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('best_weight_reps', models.PositiveIntegerField()),
+                ('estimated_1rm', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('best_weight_set', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='training.set')),
+                ('estimated_1rm_set', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='training.set')),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='training.exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='personalrecord',
+            constraint=models.UniqueConstraint(fields=('user', 'exercise'), name='personalrecord_user_exercise_uniq'),
+        ),
+    ]
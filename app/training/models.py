@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 from training.constants import REPS_UNIT_CHOICES, WEIGHT_UNIT_CHOICES, REST_UNIT_CHOICES
 
@@ -27,12 +28,32 @@ class Exercise(models.Model):
     	return self.name
 
 
+class WorkoutQuerySet(models.QuerySet):
+
+    def touch(self):
+        """
+        Mark workouts as modified, used when their exercise sets or sets change
+        """
+        return self.update(updated_at=timezone.now())
+
+
 class Workout(models.Model):
     """
     Object for training instance
     """
     date = models.DateField()
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # changed also when exercise sets or sets of workout change
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = WorkoutQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('-date', '-id')
+        indexes = [
+            models.Index(fields=['user', 'date', 'id'], name='workout_user_date_idx'),
+            models.Index(fields=['user', 'updated_at'], name='workout_user_updated_idx'),
+        ]
 
     def __str__(self):
 
@@ -47,6 +68,12 @@ class ExerciseSet(models.Model):
     exercise = models.ForeignKey('Exercise', on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    class Meta:
+        ordering = ('id',)
+        indexes = [
+            models.Index(fields=['user', 'exercise'], name='exerciseset_user_exercise_idx'),
+        ]
+
     def __str__(self):
     	return str(self.exercise)
 
@@ -57,12 +84,53 @@ class Set(models.Model):
     """
     exercise = models.ForeignKey('ExerciseSet', on_delete=models.CASCADE, related_name='set')
     reps = models.PositiveIntegerField(default=0)
-    reps_unit = models.CharField(max_length=20, choices=REPS_UNIT_CHOICES.choices(), default=REPS_UNIT_CHOICES.REPS)
+    reps_unit = models.CharField(max_length=20, choices=REPS_UNIT_CHOICES.choices(), default=REPS_UNIT_CHOICES.REPS.name)
     weight = models.DecimalField(max_digits=20, decimal_places=2)
-    weight_unit = models.CharField(max_length=20, choices=WEIGHT_UNIT_CHOICES.choices(), default=WEIGHT_UNIT_CHOICES.KG)
+    weight_unit = models.CharField(max_length=20, choices=WEIGHT_UNIT_CHOICES.choices(), default=WEIGHT_UNIT_CHOICES.KG.name)
     rest = models.PositiveIntegerField(default=0)
-    rest_unit = models.CharField(max_length=20, choices=REST_UNIT_CHOICES.choices(), default=REST_UNIT_CHOICES.MIN)
+    rest_unit = models.CharField(max_length=20, choices=REST_UNIT_CHOICES.choices(), default=REST_UNIT_CHOICES.MIN.name)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    class Meta:
+        ordering = ('id',)
+        indexes = [
+            models.Index(fields=['user', 'exercise'], name='set_user_exercise_idx'),
+        ]
+
     def __str__(self):
     	return f"{self.reps} {self.reps_unit} x {self.weight} {self.weight_unit}"
+
+
+class PersonalRecord(models.Model):
+    """
+    Object for best lift and estimated one rep max of user per exercise,
+    maintained by training.records when sets change
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    exercise = models.ForeignKey('Exercise', on_delete=models.CASCADE)
+    best_weight = models.DecimalField(max_digits=20, decimal_places=2)
+    best_weight_reps = models.PositiveIntegerField()
+    # record holding sets are recomputed by post_delete signal before
+    # the transaction deleting them commits, so no constraint is needed
+    best_weight_set = models.ForeignKey(
+                        'Set',
+                        on_delete=models.DO_NOTHING,
+                        db_constraint=False,
+                        related_name='+'
+    )
+    estimated_1rm = models.DecimalField(max_digits=20, decimal_places=2)
+    estimated_1rm_set = models.ForeignKey(
+                        'Set',
+                        on_delete=models.DO_NOTHING,
+                        db_constraint=False,
+                        related_name='+'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'exercise'], name='personalrecord_user_exercise_uniq'),
+        ]
+
+    def __str__(self):
+    	return f"{self.exercise_id}: {self.best_weight} x {self.best_weight_reps}"
@@ -0,0 +1,88 @@
+import datetime
+
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class TrainingCursorPagination(CursorPagination):
+    """
+    Keyset pagination for training.models, newest objects first.
+    Cursor pagination never runs OFFSET scans or COUNT(*), so the cost
+    of a page does not depend on how deep the client has scrolled
+    """
+    ordering = ('-id',)
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class WorkoutCursorPagination(TrainingCursorPagination):
+    """
+    Keyset pagination for workouts keyed on (date, id). Cursor position
+    holds both, so a page starts right after the last workout of the
+    previous one however many workouts share its date, where position
+    of the first ordering field alone would need an OFFSET over them
+    """
+    ordering = ('-date', '-id')
+
+    def _get_position_from_instance(self, instance, ordering):
+        return f'{instance.date.isoformat()}|{instance.pk}'
+
+    def keyset_filter(self, position, reverse):
+        """
+        Workouts following position "date|id" in (reversed) ordering
+        """
+        try:
+            date, pk = position.split('|')
+            date, pk = datetime.date.fromisoformat(date), int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if reverse:
+            return Q(date__gt=date) | Q(date=date, id__gt=pk)
+        return Q(date__lt=date) | Q(date=date, id__lt=pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        CursorPagination.paginate_queryset filtering on the whole
+        (date, id) position instead of the date alone
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        if reverse:
+            queryset = queryset.order_by('date', 'id')
+        else:
+            queryset = queryset.order_by('-date', '-id')
+        if current_position is not None:
+            queryset = queryset.filter(self.keyset_filter(current_position, reverse))
+
+        # an extra workout tells whether there is a following page
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
@@ -0,0 +1,231 @@
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import Floor, Round
+
+from training.constants import REPS_UNIT_CHOICES, WEIGHT_UNIT_CHOICES
+from training.models import ExerciseSet, Set, PersonalRecord
+from training.utils import delete_without_signals
+
+
+# only weighted repetitions count towards personal records
+ELIGIBLE_SETS = Q(
+    weight_unit=WEIGHT_UNIT_CHOICES.KG.name,
+    reps_unit=REPS_UNIT_CHOICES.REPS.name,
+    reps__gt=0,
+)
+
+RECORD_FIELDS = (
+    'best_weight', 'best_weight_reps', 'best_weight_set_id',
+    'estimated_1rm', 'estimated_1rm_set_id',
+)
+
+
+def estimate_1rm(weight, reps):
+    """
+    Estimate one rep max with Epley formula, dividing last keeps
+    halves exact so they round up as in ESTIMATED_1RM_CENTS
+    """
+    return (Decimal(weight) * (30 + reps) / 30).quantize(
+                Decimal('0.01'), rounding=ROUND_HALF_UP
+    )
+
+
+# estimate_1rm in cents computed by database, weight * (30 + reps) / 30
+# rounded half up from integer cents, so that sets estimate_1rm rounds
+# to the same value tie and the earlier set wins as in fold()
+ESTIMATED_1RM_CENTS = ExpressionWrapper(
+    Floor((Round(F('weight') * 100) * (F('reps') + 30) + 15) / Value(30.0)),
+    output_field=FloatField()
+)
+
+
+def is_eligible(training_set):
+    return (
+        training_set.weight_unit == WEIGHT_UNIT_CHOICES.KG.name
+        and training_set.reps_unit == REPS_UNIT_CHOICES.REPS.name
+        and training_set.reps > 0
+    )
+
+
+def fold(record, rows):
+    """
+    Return record fields improved by (set id, weight, reps) rows,
+    heavier weight wins, then more reps, then the earlier set
+    """
+    record = dict(record) if record else None
+    for set_id, weight, reps in rows:
+        weight = Decimal(weight)
+        estimated = estimate_1rm(weight, reps)
+        if record is None:
+            record = {
+                'best_weight': weight, 'best_weight_reps': reps, 'best_weight_set_id': set_id,
+                'estimated_1rm': estimated, 'estimated_1rm_set_id': set_id,
+            }
+            continue
+        if (weight, reps, -set_id) > (
+                record['best_weight'], record['best_weight_reps'], -record['best_weight_set_id']):
+            record.update(best_weight=weight, best_weight_reps=reps, best_weight_set_id=set_id)
+        if (estimated, -set_id) > (record['estimated_1rm'], -record['estimated_1rm_set_id']):
+            record.update(estimated_1rm=estimated, estimated_1rm_set_id=set_id)
+
+    return record
+
+
+def record_fields(record):
+    return {field: getattr(record, field) for field in RECORD_FIELDS}
+
+
+def record_sets(sets):
+    """
+    Update personal records with new or improved sets, used for sets
+    saved one by one and for sets written with bulk_create
+    """
+    sets = [training_set for training_set in sets if is_eligible(training_set)]
+    if not sets:
+        return
+
+    exercises = dict(ExerciseSet.objects.filter(
+                    pk__in={training_set.exercise_id for training_set in sets}
+    ).values_list('id', 'exercise_id'))
+
+    def key(training_set):
+        return training_set.user_id, exercises[training_set.exercise_id]
+
+    sets.sort(key=key)
+    keys = {key(training_set) for training_set in sets}
+
+    with transaction.atomic():
+        # missing records are created first so that concurrent requests
+        # never insert the same one, then every record is read locked
+        PersonalRecord.objects.bulk_create([
+            PersonalRecord(
+                user_id=user_id, exercise_id=exercise_id, best_weight=0, best_weight_reps=0,
+                best_weight_set_id=0, estimated_1rm=0, estimated_1rm_set_id=0,
+            )
+            for user_id, exercise_id in keys
+        ], ignore_conflicts=True)
+        existing = {
+            (record.user_id, record.exercise_id): record
+            for record in PersonalRecord.objects.select_for_update().filter(
+                user_id__in={user_id for user_id, exercise_id in keys},
+                exercise_id__in={exercise_id for user_id, exercise_id in keys},
+            )
+        }
+
+        for (user_id, exercise_id), group in groupby(sets, key=key):
+            record = existing[(user_id, exercise_id)]
+            # placeholder created above holds no set yet
+            current = record_fields(record) if record.best_weight_set_id else None
+            improved = fold(current, (
+                (training_set.pk, training_set.weight, training_set.reps)
+                for training_set in group
+            ))
+            if improved == current:
+                continue
+            for field, value in improved.items():
+                setattr(record, field, value)
+            record.save()
+
+
+def recompute(user_id, exercise_id):
+    """
+    Recompute personal record of user for exercise from scratch,
+    needed when record holding set is changed or deleted
+    """
+    sets = Set.objects.filter(ELIGIBLE_SETS, user_id=user_id, exercise__exercise_id=exercise_id)
+    best_weight = sets.order_by('-weight', '-reps', 'id').values_list('id', 'weight', 'reps').first()
+    if best_weight is None:
+        PersonalRecord.objects.filter(user_id=user_id, exercise_id=exercise_id).delete()
+        return
+
+    best_1rm = sets.order_by(ESTIMATED_1RM_CENTS.desc(), 'id').values_list('id', 'weight', 'reps').first()
+
+    PersonalRecord.objects.update_or_create(
+        user_id=user_id,
+        exercise_id=exercise_id,
+        defaults={
+            'best_weight': best_weight[1],
+            'best_weight_reps': best_weight[2],
+            'best_weight_set_id': best_weight[0],
+            'estimated_1rm': estimate_1rm(best_1rm[1], best_1rm[2]),
+            'estimated_1rm_set_id': best_1rm[0],
+        }
+    )
+
+
+def held_records(training_set):
+    return PersonalRecord.objects.filter(
+                Q(best_weight_set_id=training_set.pk) | Q(estimated_1rm_set_id=training_set.pk)
+    )
+
+
+def set_saved(training_set, created):
+    """
+    Keep records up to date after set is saved
+    """
+    if not created:
+        # changed record holder may no longer be the best set
+        for user_id, exercise_id in held_records(training_set).values_list('user_id', 'exercise_id'):
+            recompute(user_id, exercise_id)
+
+    record_sets([training_set])
+
+
+def set_deleted(training_set):
+    """
+    Recompute records held by deleted set
+    """
+    for user_id, exercise_id in held_records(training_set).values_list('user_id', 'exercise_id'):
+        recompute(user_id, exercise_id)
+
+
+def delete_sets(sets):
+    """
+    Delete sets queryset with one query skipping per set signals,
+    then recompute records held by deleted sets once per exercise
+    """
+    held = set(PersonalRecord.objects.filter(
+                Q(best_weight_set_id__in=sets.values('pk'))
+                | Q(estimated_1rm_set_id__in=sets.values('pk'))
+    ).values_list('user_id', 'exercise_id'))
+    # post_delete receivers of Set are skipped: response cache invalidation
+    # and workout touch are left to the caller, personal records are
+    # recomputed below
+    deleted = delete_without_signals(sets)
+    for user_id, exercise_id in held:
+        recompute(user_id, exercise_id)
+
+    return deleted
+
+
+def rebuild(users=None, chunk_size=2000):
+    """
+    Rebuild personal records in one streaming pass over sets,
+    returns number of records created
+    """
+    sets = Set.objects.filter(ELIGIBLE_SETS)
+    records = PersonalRecord.objects.all()
+    if users is not None:
+        sets = sets.filter(user__in=users)
+        records = records.filter(user__in=users)
+
+    rows = sets.order_by('user_id', 'exercise__exercise_id').values_list(
+                'user_id', 'exercise__exercise_id', 'id', 'weight', 'reps'
+    ).iterator(chunk_size=chunk_size)
+
+    count = 0
+    with transaction.atomic():
+        records.delete()
+        created = []
+        for (user_id, exercise_id), group in groupby(rows, key=lambda row: row[:2]):
+            fields = fold(None, (row[2:] for row in group))
+            created.append(PersonalRecord(user_id=user_id, exercise_id=exercise_id, **fields))
+            if len(created) >= chunk_size:
+                PersonalRecord.objects.bulk_create(created)
+                count, created = count + len(created), []
+        PersonalRecord.objects.bulk_create(created)
+
+    return count + len(created)
@@ -0,0 +1,137 @@
+import heapq
+import re
+
+
+MIN_SIMILARITY = 0.3
+
+# rank of match kinds, higher first
+EXACT_MATCH = 4
+NAME_PREFIX_MATCH = 3
+WORD_PREFIX_MATCH = 2
+MUSCLE_PREFIX_MATCH = 1
+
+
+def words(text):
+    """
+    Split text into lower case alphanumeric words
+    """
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def trigrams(text):
+    """
+    Return trigrams of words in text padded like pg_trgm,
+    so short and misspelled queries still share trigrams
+    """
+    return {
+        padded[index:index + 3]
+        for word in words(text)
+        for padded in (f'  {word} ',)
+        for index in range(len(padded) - 2)
+    }
+
+
+class ExerciseSearchIndex:
+    """
+    In memory prefix and trigram index of exercise names,
+    optionally matching names of their muscle groups
+    """
+
+    def __init__(self, exercises, muscle_groups_by_id):
+        self.names = {}
+        self.name_trigrams = {}
+        # word prefix -> ids of exercises with a word starting with it
+        self.prefixes = {}
+        self.muscle_prefixes = {}
+        # trigram -> ids of exercises with it in name
+        self.trigrams = {}
+
+        for exercise in exercises:
+            exercise_id = exercise['id']
+            self.names[exercise_id] = ' '.join(words(exercise['name']))
+            self.add_prefixes(self.prefixes, exercise['name'], exercise_id)
+            for muscle_group_id in exercise['muscles']:
+                muscle_group = muscle_groups_by_id.get(muscle_group_id)
+                if muscle_group:
+                    self.add_prefixes(self.muscle_prefixes, muscle_group['name'], exercise_id)
+
+            self.name_trigrams[exercise_id] = trigrams(exercise['name'])
+            for trigram in self.name_trigrams[exercise_id]:
+                self.trigrams.setdefault(trigram, set()).add(exercise_id)
+
+    @staticmethod
+    def add_prefixes(index, text, exercise_id):
+        for word in words(text):
+            for length in range(1, len(word) + 1):
+                index.setdefault(word[:length], set()).add(exercise_id)
+
+    @staticmethod
+    def prefix_matches(index, query_words):
+        """
+        Return ids of exercises having a word prefixed by every query word
+        """
+        matches = None
+        for word in query_words:
+            ids = index.get(word, set())
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return set()
+        return matches
+
+    def similarities(self, query):
+        """
+        Return trigram similarity of exercise names sharing trigrams with query
+        """
+        query_trigrams = trigrams(query)
+        shared = {}
+        for trigram in query_trigrams:
+            for exercise_id in self.trigrams.get(trigram, ()):
+                shared[exercise_id] = shared.get(exercise_id, 0) + 1
+
+        return {
+            exercise_id: count / (len(query_trigrams) + len(self.name_trigrams[exercise_id]) - count)
+            for exercise_id, count in shared.items()
+        }
+
+    def search(self, query, limit=10, muscles=False):
+        """
+        Return ids of exercises matching query, best first. Exact and prefix
+        matches of name rank above muscle group matches, misspelled queries
+        are matched by trigram similarity
+        """
+        query_words = words(query)
+        if not query_words:
+            return []
+        normalized = ' '.join(query_words)
+
+        ranks = {}
+        for exercise_id in self.prefix_matches(self.prefixes, query_words):
+            name = self.names[exercise_id]
+            if name == normalized:
+                ranks[exercise_id] = EXACT_MATCH
+            elif name.startswith(normalized):
+                ranks[exercise_id] = NAME_PREFIX_MATCH
+            else:
+                ranks[exercise_id] = WORD_PREFIX_MATCH
+        if muscles:
+            for exercise_id in self.prefix_matches(self.muscle_prefixes, query_words):
+                ranks.setdefault(exercise_id, MUSCLE_PREFIX_MATCH)
+
+        similarities = {}
+        if len(ranks) < limit:
+            # fill up with fuzzy matches only when prefixes aren't enough
+            similarities = self.similarities(normalized)
+            for exercise_id, similarity in similarities.items():
+                if similarity >= MIN_SIMILARITY:
+                    ranks.setdefault(exercise_id, 0)
+
+        return heapq.nsmallest(
+            limit,
+            ranks,
+            key=lambda exercise_id: (
+                -ranks[exercise_id],
+                -similarities.get(exercise_id, 0),
+                len(self.names[exercise_id]),
+                self.names[exercise_id],
+            )
+        )
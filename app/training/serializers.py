@@ -1,12 +1,101 @@
+from django.db import transaction
+
 from rest_framework import serializers
 
 from training import models
+from training.utils import bulk_create_with_pks, delete_without_signals
+from training.caching import invalidate_user
+from training.records import record_sets, delete_sets
+from training.fieldsets import SparseFieldsMixin
+from training.catalog import context_snapshot
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field resolving related objects from a map preloaded
+    into the serializer context, falling back to a query per value
+    """
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(self.field_name)
+        if preloaded is not None and not isinstance(data, bool):
+            try:
+                return preloaded[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+def collect_pks(items, key):
+    """
+    Collect integer primary keys stored under key in a list of payload dicts
+    """
+    pks = set()
+    for item in items if isinstance(items, list) else []:
+        try:
+            pks.add(int(item.get(key)))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return pks
 
 
-class SetSerializer(serializers.ModelSerializer):
+def preload_related(serializer, field_name, pks):
+    """
+    Load related objects of field_name with one query so that
+    PreloadedPrimaryKeyRelatedField doesn't query per value
+    """
+    queryset = serializer.fields[field_name].get_queryset()
+    serializer.context.setdefault('preloaded', {})[field_name] = queryset.in_bulk(pks)
+
+
+class CatalogExerciseNameField(serializers.Field):
+    """
+    Read only exercise name resolved from catalog snapshot
+    instead of joined exercise row
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', 'exercise_id')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return context_snapshot(self.context).exercise_name(value)
+
+
+class BulkSetListSerializer(serializers.ListSerializer):
+    """
+    List serializer validating many Set objects in one pass
+    and writing them with a single bulk insert
+    """
+
+    def to_internal_value(self, data):
+        # resolve every referenced exerciseset with one query
+        preload_related(self.child, 'exercise', collect_pks(data, 'exercise'))
+
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            sets = bulk_create_with_pks(
+                models.Set,
+                [models.Set(**attrs) for attrs in validated_data]
+            )
+            # bulk_create doesn't send post_save signals
+            for user_id in {obj.user_id for obj in sets}:
+                invalidate_user(user_id)
+            models.Workout.objects.filter(
+                exerciseset__in={obj.exercise_id for obj in sets}
+            ).touch()
+            record_sets(sets)
+
+        return sets
+
+
+class SetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Set object
     """
+    exercise = PreloadedPrimaryKeyRelatedField(queryset=models.ExerciseSet.objects.all())
 
     class Meta:
         model = models.Set
@@ -16,14 +105,15 @@ class SetSerializer(serializers.ModelSerializer):
             'weight_unit', 'rest', 'rest_unit'
         )
         read_only_fields =('id',)
+        list_serializer_class = BulkSetListSerializer
 
 
-class ExerciseSetSerializer(serializers.ModelSerializer):
+class ExerciseSetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for ExerciseSet object
     """
     set = SetSerializer(many=True, read_only=True)
-    exercise = serializers.StringRelatedField()
+    exercise = CatalogExerciseNameField()
     workout = serializers.StringRelatedField()
 
     class Meta:
@@ -32,7 +122,7 @@ class ExerciseSetSerializer(serializers.ModelSerializer):
         read_only_fields =('id',)
 
 
-class WorkoutSerializer(serializers.ModelSerializer):
+class WorkoutSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Workout object
     """
@@ -44,3 +134,169 @@ class WorkoutSerializer(serializers.ModelSerializer):
         model = models.Workout
         fields = ('id', 'user_id', 'date', 'exerciseset')
         read_only_fields =('id',)
+
+
+class SetTreeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for writing Set object nested in workout tree
+    """
+
+    class Meta:
+        model = models.Set
+        fields = (
+            'reps', 'reps_unit', 'weight',
+            'weight_unit', 'rest', 'rest_unit'
+        )
+
+
+class ExerciseSetTreeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for writing ExerciseSet object nested in workout tree
+    """
+    exercise = PreloadedPrimaryKeyRelatedField(queryset=models.Exercise.objects.all())
+    set = SetTreeSerializer(many=True)
+
+    class Meta:
+        model = models.ExerciseSet
+        fields = ('exercise', 'set')
+
+
+class WorkoutTreeSerializer(serializers.ModelSerializer):
+    """
+    Serializer creating or replacing a whole workout tree
+    (workout, exercise sets and sets) in one transaction
+    """
+    exerciseset = ExerciseSetTreeSerializer(many=True)
+
+    class Meta:
+        model = models.Workout
+        fields = ('date', 'exerciseset')
+
+    def to_internal_value(self, data):
+        # resolve every referenced exercise with one query
+        exercise_sets = data.get('exerciseset') if hasattr(data, 'get') else None
+        preload_related(
+            self.fields['exerciseset'].child,
+            'exercise',
+            collect_pks(exercise_sets, 'exercise')
+        )
+
+        return super().to_internal_value(data)
+
+    def create_tree(self, workout, exercise_sets):
+        """
+        Insert exercise sets and their sets with one bulk insert per level,
+        cache is invalidated by saving workout in the same transaction
+        """
+        created = bulk_create_with_pks(models.ExerciseSet, [
+            models.ExerciseSet(
+                workout=workout,
+                exercise=exercise_set['exercise'],
+                user=workout.user
+            )
+            for exercise_set in exercise_sets
+        ])
+        sets = bulk_create_with_pks(models.Set, [
+            models.Set(exercise=exercise_set, user=workout.user, **attrs)
+            for exercise_set, data in zip(created, exercise_sets)
+            for attrs in data['set']
+        ])
+        # bulk_create doesn't send signals updating personal records
+        record_sets(sets)
+
+    def create(self, validated_data):
+        exercise_sets = validated_data.pop('exerciseset')
+        with transaction.atomic():
+            workout = models.Workout.objects.create(**validated_data)
+            self.create_tree(workout, exercise_sets)
+
+        return workout
+
+    def delete_tree(self, workout):
+        """
+        Delete sets and exercise sets of workout with one query per level,
+        per row signals are replaced by saving workout and recomputing
+        personal records held by deleted sets
+        """
+        exercise_sets = models.ExerciseSet.objects.filter(workout=workout)
+        delete_sets(models.Set.objects.filter(exercise__in=exercise_sets.values('pk')))
+        # post_delete receivers of ExerciseSet are skipped: response cache
+        # invalidation and workout touch happen when update() saves workout
+        delete_without_signals(exercise_sets)
+
+    def update(self, instance, validated_data):
+        exercise_sets = validated_data.pop('exerciseset')
+        with transaction.atomic():
+            self.delete_tree(instance)
+            # saving workout touches it and invalidates cache of user
+            instance.date = validated_data.get('date', instance.date)
+            instance.save()
+            self.create_tree(instance, exercise_sets)
+
+        return instance
+
+
+class DateRangeSerializer(serializers.Serializer):
+    """
+    Serializer for optional date range query parameters
+    """
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        date_from = attrs.get('date_from')
+        date_to = attrs.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError('date_from must not be after date_to.')
+        return attrs
+
+
+class ExerciseSearchSerializer(serializers.Serializer):
+    """
+    Serializer for exercise search query parameters
+    """
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+    # also match names of muscle groups worked by exercise
+    muscles = serializers.BooleanField(default=False)
+
+
+class ExerciseSetFilterSerializer(serializers.Serializer):
+    """
+    Serializer for exercise set filtering query parameters
+    """
+    exercise = serializers.IntegerField(required=False)
+    workout = serializers.IntegerField(required=False)
+
+
+class SetFilterSerializer(ExerciseSetFilterSerializer):
+    """
+    Serializer for set filtering query parameters
+    """
+    exerciseset = serializers.IntegerField(required=False)
+
+
+class ExerciseVolumeSerializer(serializers.Serializer):
+    """
+    Serializer for training volume aggregated per exercise
+    """
+    exercise_id = serializers.IntegerField(source='exercise__exercise_id')
+    exercise = serializers.CharField(source='exercise__exercise__name')
+    weight_unit = serializers.CharField()
+    volume = serializers.DecimalField(max_digits=30, decimal_places=2)
+    set_count = serializers.IntegerField()
+    max_weight = serializers.DecimalField(max_digits=20, decimal_places=2)
+
+
+class PersonalRecordSerializer(serializers.ModelSerializer):
+    """
+    Serializer for PersonalRecord object
+    """
+    exercise = CatalogExerciseNameField()
+
+    class Meta:
+        model = models.PersonalRecord
+        fields = (
+            'exercise_id', 'exercise', 'best_weight', 'best_weight_reps',
+            'best_weight_set_id', 'estimated_1rm', 'estimated_1rm_set_id', 'updated_at'
+        )
@@ -0,0 +1,73 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from training.models import MuscleGroup, Exercise, Workout, ExerciseSet, Set
+from training.caching import invalidate_user, invalidate_catalog
+from training import records
+
+
+@receiver(post_save, sender=Workout)
+@receiver(post_save, sender=ExerciseSet)
+@receiver(post_save, sender=Set)
+@receiver(post_delete, sender=Workout)
+@receiver(post_delete, sender=ExerciseSet)
+@receiver(post_delete, sender=Set)
+def invalidate_training_cache(sender, instance, **kwargs):
+    """
+    Invalidate cached responses of user owning changed training object
+    """
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=ExerciseSet)
+@receiver(post_delete, sender=ExerciseSet)
+def touch_exerciseset_workout(sender, instance, **kwargs):
+    """
+    Propagate exercise set change to its workout
+    """
+    Workout.objects.filter(pk=instance.workout_id).touch()
+
+
+@receiver(post_save, sender=Set)
+@receiver(post_delete, sender=Set)
+def touch_set_workout(sender, instance, **kwargs):
+    """
+    Propagate set change to workout of its exercise set
+    """
+    Workout.objects.filter(exerciseset=instance.exercise_id).touch()
+
+
+@receiver(post_save, sender=Set)
+def update_personal_records(sender, instance, created, **kwargs):
+    """
+    Improve personal records with saved set
+    """
+    records.set_saved(instance, created)
+
+
+@receiver(post_delete, sender=Set)
+def recompute_personal_records(sender, instance, **kwargs):
+    """
+    Recompute personal records held by deleted set
+    """
+    records.set_deleted(instance)
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_save, sender=MuscleGroup)
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=MuscleGroup)
+def invalidate_catalog_snapshot(sender, **kwargs):
+    """
+    Rebuild catalog snapshots when exercises or muscle groups change
+    """
+    invalidate_catalog()
+
+
+@receiver(m2m_changed, sender=Exercise.muscles.through)
+def invalidate_catalog_muscles(sender, action, **kwargs):
+    """
+    Rebuild catalog snapshots when muscles of exercise change
+    """
+    if action.startswith('post_'):
+        invalidate_catalog()
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.models import Set
+from training.tests.utils import TestBaseTraining
+
+
+class TestBaseExerciseVolume(TestBaseTraining):
+    """
+    Base class for training volume aggregation
+    """
+    params = {}
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        # 3 workouts from 2021-01-01, 2 exercise sets of 2 sets (1 x 50, 2 x 50)
+        self.create_workouts(self.user, workouts=3, exercise_sets=2, sets=2)
+        Set.objects.filter(user=self.user, reps=2).update(weight=60)
+        other = self.create_user(email='other@email.com', authenticated=False)
+        self.create_workouts(other, workouts=1, exercise_sets=1, sets=1)
+        self.response = self.client.get(reverse('training:analytics-volume'), self.params)
+
+
+class TestExerciseVolume(TestBaseExerciseVolume, TestCase):
+    """
+    Test volume is aggregated per exercise for request user only
+    """
+
+    def test_should_return_aggregates(self):
+        self.assertEqual(self.response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.response.data), 1)
+        self.assertEqual(dict(self.response.data[0]), {
+            'exercise_id': Set.objects.filter(user=self.user).first().exercise.exercise_id,
+            'exercise': 'Bench Press',
+            'weight_unit': 'KG',
+            # 6 exercise sets x (1 x 50 + 2 x 60)
+            'volume': '1020.00',
+            'set_count': 12,
+            'max_weight': '60.00',
+        })
+
+    def test_should_run_single_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(reverse('training:analytics-volume'))
+
+
+class TestExerciseVolumeDateRange(TestBaseExerciseVolume, TestCase):
+    """
+    Test volume is aggregated only over workouts in date range
+    """
+    params = {'date_from': '2021-01-02', 'date_to': '2021-01-02'}
+
+    def test_should_return_aggregates_in_range(self):
+        self.assertEqual(self.response.data[0]['set_count'], 4)
+        self.assertEqual(self.response.data[0]['volume'], '340.00')
+
+
+class TestExerciseVolumeInvalidRange(TestBaseExerciseVolume, TestCase):
+    """
+    Test reversed date range fails
+    """
+    params = {'date_from': '2021-01-03', 'date_to': '2021-01-01'}
+
+    def test_should_return_bad_request(self):
+        self.assertEqual(self.response.status_code, status.HTTP_400_BAD_REQUEST)
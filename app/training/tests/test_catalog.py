@@ -0,0 +1,92 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.catalog import catalog
+from training.models import MuscleGroup
+from training.tests.utils import TestBaseTraining
+
+
+EXERCISE_URL = reverse('training:exercise-list')
+MUSCLEGROUP_URL = reverse('training:musclegroup-list')
+
+
+class TestBaseCatalog(TestBaseTraining):
+    """
+    Base class for exercise and muscle group catalog
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.muscle_group = MuscleGroup.objects.create(name='Chest')
+        self.exercise = self.create_exercise('Bench Press')
+        self.exercise.muscles.add(self.muscle_group)
+
+
+class TestCatalogApi(TestBaseCatalog, TestCase):
+    """
+    Test catalog endpoints served from snapshot
+    """
+
+    def test_should_list_exercises_without_authentication(self):
+        response = self.client.get(EXERCISE_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{
+            'id': self.exercise.id,
+            'name': 'Bench Press',
+            'description': None,
+            'muscles': [self.muscle_group.id],
+        }])
+
+    def test_should_retrieve_muscle_group(self):
+        response = self.client.get(reverse('training:musclegroup-detail', args=[self.muscle_group.id]))
+        self.assertEqual(response.data['name'], 'Chest')
+
+    def test_should_return_not_found(self):
+        response = self.client.get(reverse('training:exercise-detail', args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_should_serve_snapshot_without_queries(self):
+        self.client.get(MUSCLEGROUP_URL)
+        with self.assertNumQueries(0):
+            response = self.client.get(MUSCLEGROUP_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_should_set_cache_headers(self):
+        response = self.client.get(EXERCISE_URL)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=', response['Cache-Control'])
+
+    def test_should_return_not_modified(self):
+        etag = self.client.get(EXERCISE_URL)['ETag']
+        response = self.client.get(EXERCISE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_should_change_etag_on_catalog_change(self):
+        etag = self.client.get(EXERCISE_URL)['ETag']
+        self.create_exercise('Squat')
+        response = self.client.get(EXERCISE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+
+class TestCatalogSnapshot(TestBaseCatalog, TestCase):
+    """
+    Test snapshot is rebuilt when catalog changes
+    """
+
+    def test_should_reuse_snapshot(self):
+        self.assertIs(catalog.snapshot(), catalog.snapshot())
+
+    def test_should_rebuild_on_exercise_change(self):
+        snapshot = catalog.snapshot()
+        self.exercise.name = 'Incline Bench Press'
+        self.exercise.save()
+        self.assertEqual(catalog.snapshot().exercise_name(self.exercise.id), 'Incline Bench Press')
+        self.assertIsNot(catalog.snapshot(), snapshot)
+
+    def test_should_rebuild_on_muscles_change(self):
+        catalog.snapshot()
+        self.exercise.muscles.clear()
+        self.assertEqual(catalog.snapshot().exercises_by_id[self.exercise.id]['muscles'], [])
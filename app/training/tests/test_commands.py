@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+
+class TestExplainQuerysetsSuccessfull(TestCase):
+    """
+    Test viewset querysets are served by indexes
+    """
+
+    def test_should_report_no_full_table_scans(self):
+        out = StringIO()
+        call_command('explain_querysets', stdout=out)
+        self.assertIn('No full table scans found.', out.getvalue())
+
+
+class TestExplainQuerysetsFails(TestCase):
+    """
+    Test unfiltered queryset is reported as full table scan
+    """
+
+    @patch(
+        'training.management.commands.explain_querysets.Command.get_list_queryset',
+        lambda self, viewset, request: viewset.queryset.model.objects.all()
+    )
+    def test_should_raise_command_error(self):
+        with self.assertRaisesMessage(CommandError, 'Full table scan in: WorkoutView'):
+            call_command('explain_querysets', stdout=StringIO())
+
+
+class TestBenchmarkApi(TestCase):
+    """
+    Test API benchmark reports every endpoint and rolls back seeded data
+    """
+
+    def test_should_save_results_of_every_endpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'benchmark.json')
+            call_command(
+                'benchmark_api', users=1, workouts=2, iterations=1,
+                output=output, stdout=StringIO(), stderr=StringIO()
+            )
+            with open(output) as results_file:
+                results = json.load(results_file)
+
+        self.assertIn('user:login', results['endpoints'])
+        self.assertIn('training:workout-list', results['endpoints'])
+        for result in results['endpoints'].values():
+            self.assertLess(max(int(status) for status in result['statuses']), 400)
+            self.assertIn('p99_ms', result)
+        self.assertFalse(get_user_model().objects.exists())
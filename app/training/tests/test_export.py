@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.models import Workout
+from training.tests.utils import TestBaseTraining
+
+
+class TestBaseExport(TestBaseTraining):
+    """
+    Base class for streaming export of training history
+    """
+    export_type = 'ndjson'
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.create_workouts(self.user, workouts=2, exercise_sets=2, sets=3)
+        # workout without exercise sets is exported with empty columns
+        Workout.objects.create(user=self.user, date='2022-01-01')
+        self.response = self.client.get(reverse('training:export'), {'type': self.export_type})
+
+    @property
+    def content(self):
+        return b''.join(self.response.streaming_content).decode()
+
+
+class TestExportNdjson(TestBaseExport, TestCase):
+    """
+    Test exporting training history as NDJSON
+    """
+
+    def test_should_stream_row_per_set(self):
+        self.assertEqual(self.response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content.splitlines()]
+        self.assertEqual(len(rows), 2 * 2 * 3 + 1)
+        self.assertEqual(rows[0]['date'], '2021-01-01')
+        self.assertEqual(rows[0]['exercise'], 'Bench Press')
+        self.assertEqual(rows[0]['weight'], '50.00')
+        self.assertEqual(rows[-1]['date'], '2022-01-01')
+        self.assertIsNone(rows[-1]['set'])
+
+    def test_should_read_history_with_single_query(self):
+        response = self.client.get(reverse('training:export'))
+        with self.assertNumQueries(1):
+            b''.join(response.streaming_content)
+
+
+class TestExportCsv(TestBaseExport, TestCase):
+    """
+    Test exporting training history as CSV
+    """
+    export_type = 'csv'
+
+    def test_should_stream_header_and_row_per_set(self):
+        self.assertEqual(self.response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(self.content)))
+        self.assertEqual(len(rows), 2 * 2 * 3 + 1)
+        self.assertEqual(rows[0]['reps'], '1')
+        self.assertEqual(rows[-1]['set'], '')
+
+
+class TestExportUnknownTypeFails(TestBaseExport, TestCase):
+    """
+    Test exporting with unknown type fails
+    """
+    export_type = 'xml'
+
+    def test_should_return_bad_request(self):
+        self.assertEqual(self.response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,117 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.tests.utils import TestBaseTraining, TestBaseTrainingQueryCount
+
+
+WORKOUT_URL = reverse('training:workout-list')
+EXERCISESET_URL = reverse('training:exerciseset-list')
+
+
+class TestBaseTrainingFieldsets(TestBaseTraining):
+    """
+    Base class for selecting fields and nested levels of training endpoints
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.create_workouts(self.user, workouts=2, exercise_sets=2, sets=2)
+
+    def get_results(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+
+
+class TestWorkoutFieldsets(TestBaseTrainingFieldsets, TestCase):
+    """
+    Test ?fields= and ?expand= of workout list
+    """
+
+    def test_should_return_full_tree_by_default(self):
+        workout = self.get_results(WORKOUT_URL, {})[0]
+        self.assertEqual(set(workout), {'id', 'user_id', 'date', 'exerciseset'})
+        self.assertIn('set', workout['exerciseset'][0])
+
+    def test_should_return_requested_fields(self):
+        workout = self.get_results(WORKOUT_URL, {'fields': 'id,date'})[0]
+        self.assertEqual(set(workout), {'id', 'date'})
+
+    def test_should_return_requested_nested_fields(self):
+        workout = self.get_results(WORKOUT_URL, {'fields': 'date,exerciseset.exercise'})[0]
+        self.assertEqual(set(workout), {'date', 'exerciseset'})
+        self.assertEqual(set(workout['exerciseset'][0]), {'exercise'})
+
+    def test_should_not_expand_nested_levels(self):
+        workout = self.get_results(WORKOUT_URL, {'expand': ''})[0]
+        self.assertEqual(set(workout), {'id', 'user_id', 'date'})
+
+    def test_should_expand_requested_level_only(self):
+        workout = self.get_results(WORKOUT_URL, {'expand': 'exerciseset'})[0]
+        self.assertEqual(len(workout['exerciseset']), 2)
+        self.assertNotIn('set', workout['exerciseset'][0])
+
+    def test_should_expand_parents_of_requested_level(self):
+        workout = self.get_results(WORKOUT_URL, {'expand': 'exerciseset.set'})[0]
+        self.assertEqual(len(workout['exerciseset'][0]['set']), 2)
+
+    def test_should_ignore_selection_on_write(self):
+        payload = {'date': '2021-02-01', 'exerciseset': []}
+        response = self.client.post(
+                    reverse('training:workout-create-tree') + '?fields=id',
+                    payload,
+                    format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['date'], '2021-02-01')
+
+
+class TestExerciseSetFieldsets(TestBaseTrainingFieldsets, TestCase):
+    """
+    Test ?fields= and ?expand= of exercise set list
+    """
+
+    def test_should_return_requested_set_fields(self):
+        exercise_set = self.get_results(EXERCISESET_URL, {'fields': 'id,set.reps'})[0]
+        self.assertEqual(set(exercise_set), {'id', 'set'})
+        self.assertEqual(set(exercise_set['set'][0]), {'reps'})
+
+    def test_should_not_expand_sets(self):
+        exercise_set = self.get_results(EXERCISESET_URL, {'expand': ''})[0]
+        self.assertNotIn('set', exercise_set)
+
+
+class TestWorkoutListWithoutNestedQueryCount(TestBaseTrainingQueryCount, TestCase):
+    """
+    Test unexpanded workout list skips the prefetch queries
+    """
+    url = WORKOUT_URL + '?expand='
+    # conditional GET validators and workouts
+    expected_num_queries = 2
+
+
+class TestWorkoutListExerciseSetsQueryCount(TestBaseTrainingQueryCount, TestCase):
+    """
+    Test workout list expanded one level skips the set prefetch
+    """
+    url = WORKOUT_URL + '?expand=exerciseset'
+    expected_num_queries = 3
+
+
+class TestWorkoutListFieldsQueryCount(TestBaseTrainingQueryCount, TestCase):
+    """
+    Test workout list without nested fields skips the prefetch queries
+    """
+    url = WORKOUT_URL + '?fields=id,date'
+    expected_num_queries = 2
+
+
+class TestExerciseSetListWithoutSetsQueryCount(TestBaseTrainingQueryCount, TestCase):
+    """
+    Test unexpanded exercise set list skips the set prefetch
+    """
+    url = EXERCISESET_URL + '?expand='
+    expected_num_queries = 2
@@ -0,0 +1,103 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.models import ExerciseSet, Set
+from training.tests.utils import TestBaseTraining
+
+
+class TestBaseTrainingFilters(TestBaseTraining):
+    """
+    Base class for filtering training endpoints by query parameters
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        # workouts from 2021-01-01 to 2021-01-05 with one bench press exercise set
+        self.workouts = self.create_workouts(self.user, workouts=5, exercise_sets=1, sets=2)
+        self.squat = self.create_exercise('Squat')
+        self.squat_set = ExerciseSet.objects.create(
+                            user=self.user,
+                            workout=self.workouts[0],
+                            exercise=self.squat
+        )
+        Set.objects.create(user=self.user, exercise=self.squat_set, reps=5, weight=100)
+
+    def get_results(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+
+
+class TestWorkoutDateFilter(TestBaseTrainingFilters, TestCase):
+    """
+    Test filtering workouts by date range
+    """
+
+    def test_should_return_workouts_in_range(self):
+        results = self.get_results(
+            reverse('training:workout-list'),
+            {'date_from': '2021-01-02', 'date_to': '2021-01-04'}
+        )
+        self.assertEqual(
+            [workout['date'] for workout in results],
+            ['2021-01-04', '2021-01-03', '2021-01-02']
+        )
+
+    def test_should_reject_invalid_date(self):
+        response = self.client.get(reverse('training:workout-list'), {'date_from': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestExerciseSetFilter(TestBaseTrainingFilters, TestCase):
+    """
+    Test filtering exercise sets by exercise and workout
+    """
+
+    def test_should_return_exercise_sets_of_exercise(self):
+        results = self.get_results(reverse('training:exerciseset-list'), {'exercise': self.squat.id})
+        self.assertEqual([obj['id'] for obj in results], [self.squat_set.id])
+
+    def test_should_return_exercise_sets_of_workout(self):
+        results = self.get_results(reverse('training:exerciseset-list'), {'workout': self.workouts[0].id})
+        self.assertEqual(len(results), 2)
+
+
+class TestSetFilter(TestBaseTrainingFilters, TestCase):
+    """
+    Test filtering sets by exercise, exercise set and workout
+    """
+
+    def test_should_return_sets_of_exercise(self):
+        results = self.get_results(reverse('training:set-list'), {'exercise': self.squat.id})
+        self.assertEqual([obj['weight'] for obj in results], ['100.00'])
+
+    def test_should_return_sets_of_exercise_set(self):
+        exercise_set = self.workouts[1].exerciseset.get()
+        results = self.get_results(reverse('training:set-list'), {'exerciseset': exercise_set.id})
+        self.assertEqual(len(results), 2)
+
+    def test_should_return_sets_of_workout(self):
+        results = self.get_results(reverse('training:set-list'), {'workout': self.workouts[0].id})
+        self.assertEqual(len(results), 3)
+
+    def test_should_resolve_exercise_sets_of_user_only(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_results(reverse('training:set-list'), {'exercise': self.squat.id})
+        sql = next(query['sql'] for query in queries.captured_queries if 'FROM "training_set"' in query['sql'])
+        self.assertIn(f'U0."user_id" = {self.user.id}', sql)
+
+    def test_should_return_sets_of_every_user_for_admin(self):
+        other = self.create_user(email='other@email.com')
+        other_set = ExerciseSet.objects.create(user=other, workout=self.workouts[0], exercise=self.squat)
+        Set.objects.create(user=other, exercise=other_set, reps=5, weight=120)
+        self.user.is_superuser = True
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+
+        results = self.get_results(reverse('training:set-list'), {'exercise': self.squat.id})
+        self.assertEqual([obj['weight'] for obj in results], ['120.00', '100.00'])
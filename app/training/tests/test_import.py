@@ -0,0 +1,166 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.importer import TrainingImporter, parse_csv
+from training.models import Workout, ExerciseSet, Set
+from training.tests.utils import TestBaseTraining
+
+
+CSV_CONTENT = (
+    'date,exercise,reps,weight,weight_unit\n'
+    '2021-01-01,Bench Press,10,50,KG\n'
+    '2021-01-01,bench press,8,55,KG\n'
+    '2021-01-01,Squat,5,100,KG\n'
+    '2021-01-02,Squat,5,105,KG\n'
+    '2021-01-02,Unknown Lift,5,105,KG\n'
+    '2021-01-03,Squat,5,heavy,KG\n'
+)
+
+NDJSON_CONTENT = (
+    '{"date": "2021-01-01", "exercise": "Squat", "reps": 5, "weight": "100.00"}\n'
+    'not json\n'
+    '\n'
+    '{"date": "2021-01-02"}\n'
+)
+
+
+class TestBaseImport(TestBaseTraining):
+    """
+    Base class for importing training history
+    """
+    file_name = 'history.csv'
+    content = CSV_CONTENT
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.create_exercise('Bench Press')
+        self.create_exercise('Squat')
+        upload = SimpleUploadedFile(self.file_name, self.content.encode())
+        self.response = self.client.post(reverse('training:import'), {'file': upload})
+
+
+class TestImportCsv(TestBaseImport, TestCase):
+    """
+    Test importing CSV groups rows into workouts and exercise sets
+    and reports invalid rows
+    """
+
+    def test_should_create_training_history(self):
+        self.assertEqual(self.response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Workout.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(ExerciseSet.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(Set.objects.filter(user=self.user).count(), 4)
+
+    def test_should_report_row_errors(self):
+        self.assertEqual(self.response.data['rows'], 6)
+        self.assertEqual(self.response.data['error_count'], 2)
+        self.assertEqual(
+            [error['line'] for error in self.response.data['errors']],
+            [6, 7]
+        )
+        self.assertEqual(
+            self.response.data['errors'][0]['errors'],
+            {'exercise': ['Unknown exercise "Unknown Lift".']}
+        )
+
+
+class TestImportNdjson(TestBaseImport, TestCase):
+    """
+    Test importing NDJSON reports malformed lines
+    """
+    file_name = 'history.ndjson'
+    content = NDJSON_CONTENT
+
+    def test_should_create_training_history(self):
+        self.assertEqual(Workout.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(Set.objects.filter(user=self.user).count(), 1)
+
+    def test_should_report_malformed_line(self):
+        self.assertEqual(self.response.data['error_count'], 1)
+        self.assertEqual(self.response.data['errors'][0]['line'], 2)
+
+
+class TestImportExportRoundTrip(TestBaseImport, TestCase):
+    """
+    Test exported history imports back unchanged
+    """
+    content = ''
+
+    def test_should_import_exported_history(self):
+        other = self.create_user(email='other@email.com')
+        self.create_workouts(other, workouts=3, exercise_sets=2, sets=2)
+        response = self.client.get(reverse('training:export'), {'type': 'csv'})
+        upload = SimpleUploadedFile('export.csv', b''.join(response.streaming_content))
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('training:import'), {'file': upload})
+
+        self.assertEqual(response.data['error_count'], 0)
+        self.assertEqual(Workout.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(ExerciseSet.objects.filter(user=self.user).count(), 6)
+        self.assertEqual(Set.objects.filter(user=self.user).count(), 12)
+
+
+class TestImportBatches(TestBaseImport, TestCase):
+    """
+    Test workouts spanning several batches are not duplicated
+    """
+    content = ''
+
+    def test_should_reuse_objects_from_previous_batches(self):
+        progress = []
+        importer = TrainingImporter(self.user, batch_size=2, progress=lambda result: progress.append(result['rows']))
+        result = importer.run(parse_csv(CSV_CONTENT.splitlines(keepends=True)))
+
+        self.assertEqual(progress, [2, 4, 6])
+        self.assertEqual(result['workouts'], 2)
+        self.assertEqual(Workout.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(ExerciseSet.objects.filter(user=self.user).count(), 3)
+
+    def test_should_touch_workouts_of_previous_batches(self):
+        modified = []
+        importer = TrainingImporter(self.user, batch_size=2, progress=lambda result: modified.append(
+            Workout.objects.get(user=self.user, date='2021-01-01').updated_at
+        ))
+        importer.run(parse_csv(CSV_CONTENT.splitlines(keepends=True)))
+
+        # second batch adds squat to workout created by the first one
+        self.assertLess(modified[0], modified[1])
+
+
+class TestImportUnknownTypeFails(TestBaseImport, TestCase):
+    """
+    Test importing file of unknown type fails
+    """
+    file_name = 'history.xml'
+
+    def test_should_return_bad_request(self):
+        self.assertEqual(self.response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestImportTrainingCommand(TestBaseTraining, TestCase):
+    """
+    Test import_training command imports file for user
+    """
+
+    def test_should_import_file(self):
+        user = self.create_user()
+        self.create_exercise('Bench Press')
+        self.create_exercise('Squat')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as import_file:
+            import_file.write(CSV_CONTENT)
+        self.addCleanup(os.remove, import_file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_training', user.email, import_file.name, stdout=out, stderr=err)
+
+        self.assertIn('Imported 2 workouts, 3 exercise sets and 4 sets.', out.getvalue())
+        self.assertIn('line 6:', err.getvalue())
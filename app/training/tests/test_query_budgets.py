@@ -0,0 +1,156 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.tests.utils import TestBaseTraining, TestBaseQueryBudget
+from training.views import SetView
+from workout.budgets import QueryBudgetExceeded
+
+
+class TestWorkoutListBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test workout list stays within query budget
+    """
+
+    def request(self, size):
+        return self.client.get(reverse('training:workout-list'))
+
+
+class TestWorkoutRetrieveBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test workout retrieve stays within query budget
+    """
+
+    def request(self, size):
+        return self.client.get(reverse('training:workout-detail', args=[self.workout.id]))
+
+
+class TestWorkoutCreateBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test workout create stays within query budget
+    """
+    expected_status = status.HTTP_201_CREATED
+
+    def request(self, size):
+        return self.client.post(reverse('training:workout-list'), {'date': '2022-01-01'})
+
+
+class TestBaseWorkoutTreeBudget(TestBaseQueryBudget):
+    """
+    Base class writing workout trees growing with data size
+    """
+
+    def payload(self, size):
+        workouts, exercise_sets, sets = size
+        return {
+            'date': '2022-01-01',
+            'exerciseset': [
+                {
+                    'exercise': self.exercise_set.exercise_id,
+                    'set': [{'reps': reps + 1, 'weight': '60.00'} for reps in range(sets)],
+                }
+                for _ in range(exercise_sets)
+            ],
+        }
+
+
+class TestWorkoutCreateTreeBudget(TestBaseWorkoutTreeBudget, TestCase):
+    """
+    Test workout tree create stays within query budget
+    """
+    expected_status = status.HTTP_201_CREATED
+
+    def request(self, size):
+        return self.client.post(reverse('training:workout-create-tree'), self.payload(size), format='json')
+
+
+class TestWorkoutReplaceTreeBudget(TestBaseWorkoutTreeBudget, TestCase):
+    """
+    Test workout tree replace stays within query budget
+    """
+
+    def request(self, size):
+        return self.client.put(
+                    reverse('training:workout-replace-tree', args=[self.workout.id]),
+                    self.payload(size),
+                    format='json'
+        )
+
+
+class TestExerciseSetListBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test exercise set list stays within query budget
+    """
+
+    def request(self, size):
+        return self.client.get(reverse('training:exerciseset-list'))
+
+
+class TestExerciseSetRetrieveBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test exercise set retrieve stays within query budget
+    """
+
+    def request(self, size):
+        return self.client.get(reverse('training:exerciseset-detail', args=[self.exercise_set.id]))
+
+
+class TestSetListBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test set list stays within query budget
+    """
+
+    def request(self, size):
+        return self.client.get(reverse('training:set-list'))
+
+
+class TestSetRetrieveBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test set retrieve stays within query budget
+    """
+
+    def request(self, size):
+        set_id = self.exercise_set.set.last().id
+        return self.client.get(reverse('training:set-detail', args=[set_id]))
+
+
+class TestSetBulkCreateBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test set create with growing list payload stays within query budget
+    """
+    expected_status = status.HTTP_201_CREATED
+
+    def request(self, size):
+        workouts, exercise_sets, sets = size
+        payload = [{'exercise': self.exercise_set.id, 'reps': 5, 'weight': '100.00'}] * sets
+        return self.client.post(reverse('training:set-list'), payload, format='json')
+
+
+class TestQueryBudgetExceeded(TestBaseTraining, TestCase):
+    """
+    Test request over budget raises in tests and is logged otherwise
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_workouts(self.create_user())
+
+    def request(self, size):
+        return self.client.get(reverse('training:set-list'))
+
+    @patch.object(SetView, 'query_budgets', {'list': 1})
+    def test_should_raise_over_budget(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'SetView.list ran'):
+            with override_settings(QUERY_BUDGET_RAISE=True):
+                self.request(None)
+
+    @patch.object(SetView, 'query_budgets', {'list': 1})
+    def test_should_log_over_budget(self):
+        with self.assertLogs('workout.budgets', level='WARNING') as logs:
+            with override_settings(QUERY_BUDGET_RAISE=False):
+                response = self.request(None)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('budget is 1', logs.output[0])
@@ -0,0 +1,145 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.catalog import catalog
+from training.models import Set, PersonalRecord
+from training.records import delete_sets, estimate_1rm
+from training.tests.utils import TestBaseTraining
+
+
+class TestBasePersonalRecords(TestBaseTraining):
+    """
+    Base class for personal records maintained on set changes
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        workout = self.create_workouts(self.user, workouts=1, exercise_sets=1, sets=0)[0]
+        self.exercise_set = workout.exerciseset.get()
+        self.heavy = self.create_set(weight=100, reps=3)
+        self.volume = self.create_set(weight=80, reps=12)
+        self.light = self.create_set(weight=50, reps=5)
+
+    def create_set(self, weight, reps, **kwargs):
+        return Set.objects.create(
+                    user=self.user,
+                    exercise=self.exercise_set,
+                    weight=weight,
+                    reps=reps,
+                    **kwargs
+        )
+
+    @property
+    def record(self):
+        return PersonalRecord.objects.get(user=self.user, exercise=self.exercise_set.exercise)
+
+
+class TestPersonalRecordMaintenance(TestBasePersonalRecords, TestCase):
+    """
+    Test personal records follow set saves and deletes
+    """
+
+    def test_should_track_best_weight_and_estimated_1rm(self):
+        self.assertEqual(self.record.best_weight, Decimal('100.00'))
+        self.assertEqual(self.record.best_weight_set_id, self.heavy.id)
+        # 80 x 12 estimates higher one rep max than 100 x 3
+        self.assertEqual(self.record.estimated_1rm, Decimal('112.00'))
+        self.assertEqual(self.record.estimated_1rm_set_id, self.volume.id)
+
+    def test_should_improve_with_heavier_set(self):
+        heavier = self.create_set(weight=105, reps=1)
+        self.assertEqual(self.record.best_weight_set_id, heavier.id)
+        self.assertEqual(self.record.estimated_1rm_set_id, self.volume.id)
+
+    def test_should_recompute_when_holder_deleted(self):
+        self.heavy.delete()
+        self.assertEqual(self.record.best_weight, Decimal('80.00'))
+        self.assertEqual(self.record.best_weight_set_id, self.volume.id)
+
+    def test_should_recompute_when_holder_gets_worse(self):
+        self.volume.reps = 1
+        self.volume.save()
+        self.assertEqual(self.record.estimated_1rm, estimate_1rm(100, 3))
+        self.assertEqual(self.record.estimated_1rm_set_id, self.heavy.id)
+
+    def test_should_recompute_after_deleting_sets_without_signals(self):
+        with mock.patch('training.signals.records.set_deleted') as set_deleted:
+            deleted = delete_sets(Set.objects.filter(pk__in=(self.heavy.pk, self.volume.pk)))
+        self.assertEqual(deleted, 2)
+        set_deleted.assert_not_called()
+        self.assertEqual(list(Set.objects.values_list('pk', flat=True)), [self.light.pk])
+        self.assertEqual(self.record.best_weight_set_id, self.light.id)
+        self.assertEqual(self.record.estimated_1rm_set_id, self.light.id)
+
+    def test_should_recompute_tied_estimates_as_earlier_set(self):
+        # 97.06 x 4 estimates 110.0013, rounded equal to 100 x 3
+        tied = self.create_set(weight=Decimal('97.06'), reps=4)
+        self.assertEqual(estimate_1rm(tied.weight, tied.reps), estimate_1rm(100, 3))
+        self.volume.delete()
+        self.assertEqual(self.record.estimated_1rm, Decimal('110.00'))
+        self.assertEqual(self.record.estimated_1rm_set_id, self.heavy.id)
+
+    def test_should_round_half_up_estimate(self):
+        self.assertEqual(estimate_1rm(Decimal('31.05'), 7), Decimal('38.30'))
+
+    def test_should_remove_record_without_sets(self):
+        self.exercise_set.delete()
+        self.assertFalse(PersonalRecord.objects.exists())
+
+    def test_should_ignore_body_weight_sets(self):
+        self.create_set(weight=500, reps=1, weight_unit='BW')
+        self.assertEqual(self.record.best_weight, Decimal('100.00'))
+
+    def test_should_update_records_on_bulk_create(self):
+        self.client.post(
+            reverse('training:set-list'),
+            [{'exercise': self.exercise_set.id, 'reps': 2, 'weight': 150}],
+            format='json'
+        )
+        self.assertEqual(self.record.best_weight, Decimal('150.00'))
+
+
+class TestPersonalRecordView(TestBasePersonalRecords, TestCase):
+    """
+    Test listing personal records reads records table only
+    """
+
+    def test_should_list_records_with_single_query(self):
+        # exercise names come from catalog snapshot
+        catalog.snapshot()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('training:records'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['exercise'], 'Bench Press')
+        self.assertEqual(response.data[0]['best_weight'], '100.00')
+        self.assertEqual(response.data[0]['estimated_1rm'], '112.00')
+
+    def test_should_filter_by_exercise(self):
+        response = self.client.get(reverse('training:records'), {'exercise': 0})
+        self.assertEqual(response.data, [])
+
+
+class TestRebuildPersonalRecords(TestBasePersonalRecords, TestCase):
+    """
+    Test rebuild command recreates records from sets
+    """
+
+    def test_should_rebuild_same_records(self):
+        expected = PersonalRecord.objects.values(
+                        'user', 'exercise', 'best_weight', 'best_weight_set',
+                        'estimated_1rm', 'estimated_1rm_set'
+        ).get()
+        PersonalRecord.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_personal_records', stdout=out)
+
+        self.assertIn('Rebuilt 1 personal records.', out.getvalue())
+        self.assertEqual(PersonalRecord.objects.values(*expected).get(), expected)
@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.models import MuscleGroup
+from training.search import ExerciseSearchIndex
+from training.tests.utils import TestBaseTraining
+
+
+SEARCH_URL = reverse('training:exercise-search')
+
+
+class TestExerciseSearchIndex(TestCase):
+    """
+    Test ranking of exercise search index
+    """
+
+    def setUp(self):
+        exercises = [
+            {'id': 1, 'name': 'Bench Press', 'muscles': [1]},
+            {'id': 2, 'name': 'Incline Bench Press', 'muscles': [1]},
+            {'id': 3, 'name': 'Bench', 'muscles': []},
+            {'id': 4, 'name': 'Squat', 'muscles': [2]},
+            {'id': 5, 'name': 'Leg Press', 'muscles': [2]},
+        ]
+        muscle_groups = {1: {'id': 1, 'name': 'Chest'}, 2: {'id': 2, 'name': 'Quads'}}
+        self.index = ExerciseSearchIndex(exercises, muscle_groups)
+
+    def test_should_rank_exact_and_prefix_matches_first(self):
+        self.assertEqual(self.index.search('bench'), [3, 1, 2])
+
+    def test_should_match_word_prefixes(self):
+        self.assertEqual(self.index.search('pre'), [5, 1, 2])
+        self.assertEqual(self.index.search('inc ben'), [2])
+
+    def test_should_match_misspelled_name(self):
+        self.assertEqual(self.index.search('sqat'), [4])
+
+    def test_should_match_muscle_groups_when_requested(self):
+        self.assertEqual(self.index.search('quad'), [])
+        self.assertEqual(self.index.search('quad', muscles=True), [4, 5])
+
+    def test_should_limit_results(self):
+        self.assertEqual(len(self.index.search('press', limit=1)), 1)
+
+    def test_should_ignore_empty_query(self):
+        self.assertEqual(self.index.search(' - '), [])
+
+
+class TestExerciseSearchApi(TestBaseTraining, TestCase):
+    """
+    Test exercise search endpoint
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.bench_press = self.create_exercise('Bench Press')
+        self.squat = self.create_exercise('Squat')
+        self.squat.muscles.add(MuscleGroup.objects.create(name='Quads'))
+
+    def test_should_return_ranked_exercises(self):
+        response = self.client.get(SEARCH_URL, {'q': 'ben'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([exercise['name'] for exercise in response.data], ['Bench Press'])
+
+    def test_should_search_muscle_groups(self):
+        response = self.client.get(SEARCH_URL, {'q': 'quad', 'muscles': 'true'})
+        self.assertEqual([exercise['id'] for exercise in response.data], [self.squat.id])
+
+    def test_should_rebuild_index_on_catalog_change(self):
+        self.client.get(SEARCH_URL, {'q': 'dead'})
+        self.create_exercise('Deadlift')
+        response = self.client.get(SEARCH_URL, {'q': 'dead'})
+        self.assertEqual([exercise['name'] for exercise in response.data], ['Deadlift'])
+
+    def test_should_require_query(self):
+        response = self.client.get(SEARCH_URL)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,313 @@
+import base64
+import datetime
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase
+from django.db import connection, NotSupportedError
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+
+from training.tests.utils import (
+                        TestBaseTrainingQueryCount,
+                        TestBaseTrainingPagination,
+                        TestBaseSetBulkCreate,
+                        TestBaseWorkoutTree,
+                        TestBaseTrainingCache,
+                        TestBaseTrainingConditional,
+                      )
+from training.models import Workout, ExerciseSet, Set, PersonalRecord
+
+
+class TestWorkoutListQueryCount(TestBaseTrainingQueryCount, TestCase):
+    """
+    Test listing workouts prefetches the whole exerciseset -> set tree
+    """
+    url = reverse('training:workout-list')
+    # validators, workouts, exercise sets joined with exercise, sets
+    expected_num_queries = 4
+
+
+class TestExerciseSetListQueryCount(TestBaseTrainingQueryCount, TestCase):
+    """
+    Test listing exercise sets joins exercise and workout, prefetches sets
+    """
+    url = reverse('training:exerciseset-list')
+    expected_num_queries = 3
+
+
+class TestSetListQueryCount(TestBaseTrainingQueryCount, TestCase):
+    """
+    Test listing sets runs a single query besides validators
+    """
+    url = reverse('training:set-list')
+    expected_num_queries = 2
+
+
+class TestWorkoutPagination(TestBaseTrainingPagination, TestCase):
+    """
+    Test workouts are paginated by cursor ordered by date
+    """
+    url = reverse('training:workout-list')
+
+    def test_should_order_by_date_descending(self):
+        dates = [obj['date'] for obj in self.results]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_should_page_through_workouts_sharing_date(self):
+        date = datetime.date(2021, 1, 3)
+        for _ in range(3):
+            Workout.objects.create(user=self.user, date=date)
+        expected = list(Workout.objects.filter(user=self.user)
+                        .order_by('-date', '-id').values_list('id', flat=True))
+
+        pages = []
+        url = f'{self.url}?page_size={self.page_size}'
+        while url:
+            response = self.client.get(url)
+            # keyset cursors never fall back to an offset
+            for link in (response.data['next'], response.data['previous']):
+                if link:
+                    cursor = parse_qs(urlparse(link).query)['cursor'][0]
+                    self.assertNotIn('o', parse_qs(base64.b64decode(cursor).decode()))
+            pages.append([obj['id'] for obj in response.data['results']])
+            url = response.data['next']
+        self.assertEqual([pk for page in pages for pk in page], expected)
+
+        # previous links walk the same pages back
+        url = response.data['previous']
+        for page in reversed(pages[:-1]):
+            response = self.client.get(url)
+            self.assertEqual([obj['id'] for obj in response.data['results']], page)
+            url = response.data['previous']
+        self.assertIsNone(url)
+
+    def test_should_reject_malformed_cursor_position(self):
+        cursor = base64.b64encode(b'p=2021-01-03').decode()
+        response = self.client.get(f'{self.url}?cursor={cursor}')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestExerciseSetPagination(TestBaseTrainingPagination, TestCase):
+    """
+    Test exercise sets are paginated by cursor
+    """
+    url = reverse('training:exerciseset-list')
+
+
+class TestSetPagination(TestBaseTrainingPagination, TestCase):
+    """
+    Test sets are paginated by cursor
+    """
+    url = reverse('training:set-list')
+
+
+class TestSetBulkCreateSuccessfull(TestBaseSetBulkCreate, TestCase):
+    """
+    Test posting a list of sets creates all of them for request user
+    """
+    sets = 5
+
+    def test_should_return_created(self):
+        self.assertEqual(self.response.status_code, status.HTTP_201_CREATED)
+
+    def test_should_create_sets_for_user(self):
+        sets = Set.objects.filter(exercise=self.exercise_set, user=self.user)
+        self.assertEqual(sets.count(), self.sets)
+
+    def test_should_return_created_ids(self):
+        ids = [obj['id'] for obj in self.response.data]
+        self.assertEqual(ids, list(Set.objects.order_by('id').values_list('id', flat=True)))
+        self.assertEqual([obj['reps'] for obj in self.response.data], [1, 2, 3, 4, 5])
+
+    def test_should_run_fixed_number_of_queries(self):
+        counts = []
+        for sets in (2, 20):
+            payload = [{'exercise': self.exercise_set.id, 'reps': 1, 'weight': 1}] * sets
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(reverse('training:set-list'), payload, format='json')
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_should_refuse_backend_without_returned_ids(self):
+        # guessing ids from newest rows is only safe under sqlite write lock
+        payload = [{'exercise': self.exercise_set.id, 'reps': 1, 'weight': 1}] * 2
+        with mock.patch.object(connection, 'vendor', 'mysql'), \
+                mock.patch.object(connection.features, 'can_return_rows_from_bulk_insert', False), \
+                self.assertRaises(NotSupportedError):
+            self.client.post(reverse('training:set-list'), payload, format='json')
+
+
+class TestSetBulkCreateFails(TestBaseSetBulkCreate, TestCase):
+    """
+    Test posting a list with one invalid set creates nothing
+    """
+    valid = False
+
+    def test_should_return_bad_request(self):
+        self.assertEqual(self.response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.response.data[-1], {'weight': ['A valid number is required.']})
+
+    def test_should_not_create_sets(self):
+        self.assertFalse(Set.objects.exists())
+
+
+class TestWorkoutTreeCreateSuccessfull(TestBaseWorkoutTree, TestCase):
+    """
+    Test posting a workout tree creates workout, exercise sets and sets
+    """
+
+    def test_should_return_created_tree(self):
+        self.assertEqual(self.response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.response.data['date'], '2021-04-01')
+        self.assertEqual(
+            [exercise_set['exercise'] for exercise_set in self.response.data['exerciseset']],
+            ['Exercise 0', 'Exercise 1']
+        )
+        self.assertEqual(
+            [len(exercise_set['set']) for exercise_set in self.response.data['exerciseset']],
+            [self.sets, self.sets]
+        )
+
+    def test_should_create_objects_for_user(self):
+        self.assertEqual(Workout.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(ExerciseSet.objects.filter(user=self.user).count(), self.exercise_sets)
+        self.assertEqual(Set.objects.filter(user=self.user).count(), self.exercise_sets * self.sets)
+
+    def test_should_run_fixed_number_of_queries(self):
+        counts = []
+        for self.sets in (1, 10):
+            # new exercises so each run creates the same number of personal records
+            exercises = [self.create_exercise(f'{self.sets} {number}') for number in range(2)]
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(
+                    reverse('training:workout-create-tree'),
+                    self.payload(exercises),
+                    format='json'
+                )
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class TestWorkoutTreeReplaceSuccessfull(TestBaseWorkoutTree, TestCase):
+    """
+    Test putting a workout tree replaces its date, exercise sets and sets
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.sets = 1
+        self.exercise_sets = 1
+        self.response = self.client.put(
+                            reverse('training:workout-replace-tree', args=[self.response.data['id']]),
+                            self.payload(self.exercises[1:], date='2021-04-02'),
+                            format='json'
+        )
+
+    def test_should_return_replaced_tree(self):
+        self.assertEqual(self.response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.response.data['date'], '2021-04-02')
+        self.assertEqual(len(self.response.data['exerciseset']), 1)
+        self.assertEqual(self.response.data['exerciseset'][0]['exercise'], 'Exercise 1')
+
+    def test_should_remove_previous_children(self):
+        self.assertEqual(ExerciseSet.objects.count(), 1)
+        self.assertEqual(Set.objects.count(), 1)
+
+    def test_should_replace_personal_records(self):
+        records = PersonalRecord.objects.filter(user=self.user)
+        self.assertEqual(list(records.values_list('exercise__name', 'best_weight_set')), [
+            ('Exercise 1', Set.objects.get().id),
+        ])
+
+    def test_should_run_fixed_number_of_queries(self):
+        counts = []
+        self.exercise_sets = 2
+        for self.sets in (1, 10):
+            # new exercises so each run replaces the same personal records
+            exercises = [self.create_exercise(f'{self.sets} {number}') for number in range(2)]
+            workout = self.client.post(
+                            reverse('training:workout-create-tree'),
+                            self.payload(exercises),
+                            format='json'
+            ).data
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.put(
+                    reverse('training:workout-replace-tree', args=[workout['id']]),
+                    self.payload(exercises),
+                    format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class TestWorkoutTreeCreateFails(TestBaseWorkoutTree, TestCase):
+    """
+    Test posting a workout tree with unknown exercise creates nothing
+    """
+    valid = False
+
+    def test_should_return_bad_request(self):
+        self.assertEqual(self.response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_should_not_create_objects(self):
+        self.assertFalse(Workout.objects.exists())
+        self.assertFalse(Set.objects.exists())
+
+
+class TestWorkoutListCache(TestBaseTrainingCache, TestCase):
+    """
+    Test workout list is cached per user and invalidated on changes
+    """
+    url = reverse('training:workout-list')
+
+    def test_should_invalidate_on_bulk_create(self):
+        exercise_set = self.workout.exerciseset.get()
+        self.client.post(
+            reverse('training:set-list'),
+            [{'exercise': exercise_set.id, 'reps': 1, 'weight': 1}],
+            format='json'
+        )
+        self.assertNotEqual(self.client.get(self.url).data, self.response.data)
+
+
+class TestWorkoutDetailCache(TestBaseTrainingCache, TestCase):
+    """
+    Test workout detail is cached per user and invalidated on changes
+    """
+    @property
+    def url(self):
+        return reverse('training:workout-detail', args=[self.workout.id])
+
+
+class TestSetListCache(TestBaseTrainingCache, TestCase):
+    """
+    Test set list is cached per user and invalidated on changes
+    """
+    url = reverse('training:set-list')
+
+
+class TestWorkoutListConditional(TestBaseTrainingConditional, TestCase):
+    """
+    Test conditional GET of workout list
+    """
+    url = reverse('training:workout-list')
+
+
+class TestWorkoutDetailConditional(TestBaseTrainingConditional, TestCase):
+    """
+    Test conditional GET of workout detail
+    """
+    @property
+    def url(self):
+        return reverse('training:workout-detail', args=[self.workout.id])
+
+
+class TestSetListConditional(TestBaseTrainingConditional, TestCase):
+    """
+    Test conditional GET of set list
+    """
+    url = reverse('training:set-list')
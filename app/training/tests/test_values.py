@@ -0,0 +1,86 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from training.fieldsets import FieldSelection
+from training.models import ExerciseSet, Set
+from training.serializers import SetSerializer, ExerciseSetSerializer
+from training.tests.utils import TestBaseTraining
+from training.values import SetValuesSerializer, ExerciseSetValuesSerializer
+
+
+class TestBaseValuesSerializer(TestBaseTraining):
+    """
+    Base class comparing .values() fast path with model serializer
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.create_workouts(self.user, workouts=2, exercise_sets=2, sets=3)
+        Set.objects.create(
+            user=self.user,
+            exercise=ExerciseSet.objects.first(),
+            reps=30,
+            reps_unit='SEC',
+            weight='72.5',
+            weight_unit='LBS',
+            rest=90,
+            rest_unit='SEC',
+        )
+        ExerciseSet.objects.create(
+            user=self.user,
+            workout=ExerciseSet.objects.first().workout,
+            exercise=self.create_exercise('Squat')
+        )
+
+    def serialize(self, values_serializer, queryset):
+        return values_serializer.to_representation(values_serializer.values(queryset))
+
+
+class TestSetValuesSerializer(TestBaseValuesSerializer, TestCase):
+    """
+    Test fast path of set serializer
+    """
+
+    def test_should_match_model_serializer(self):
+        self.assertEqual(
+            self.serialize(SetValuesSerializer(), Set.objects.all()),
+            SetSerializer(Set.objects.all(), many=True).data
+        )
+
+    def test_should_return_selected_fields(self):
+        data = self.serialize(SetValuesSerializer(FieldSelection(fields='id,weight')), Set.objects.all())
+        self.assertEqual(list(data[0]), ['id', 'weight'])
+
+
+class TestExerciseSetValuesSerializer(TestBaseValuesSerializer, TestCase):
+    """
+    Test fast path of exercise set serializer
+    """
+
+    def test_should_match_model_serializer(self):
+        self.assertEqual(
+            self.serialize(ExerciseSetValuesSerializer(), ExerciseSet.objects.all()),
+            ExerciseSetSerializer(ExerciseSet.objects.all(), many=True).data
+        )
+
+    def test_should_not_expand_sets(self):
+        data = self.serialize(
+                    ExerciseSetValuesSerializer(FieldSelection(expand='')),
+                    ExerciseSet.objects.all()
+        )
+        self.assertEqual(list(data[0]), ['id', 'user_id', 'workout', 'exercise'])
+
+
+class TestBenchmarkSerializers(TestCase):
+    """
+    Test serializer benchmark command
+    """
+
+    def test_should_report_both_serializers(self):
+        out = StringIO()
+        call_command('benchmark_serializers', sizes='20', repeat=1, stdout=out)
+        self.assertIn('Set', out.getvalue())
+        self.assertIn('ExerciseSet', out.getvalue())
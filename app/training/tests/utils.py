@@ -0,0 +1,328 @@
+import datetime
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from training.models import Workout, Exercise, ExerciseSet, Set
+from training.catalog import catalog
+from user.authentication import token_cache
+
+
+USER = get_user_model()
+
+
+class TestBaseTraining:
+    """
+    Base class for training api test cases
+    """
+    email = 'test@email.com'
+    password = 'testpassword'
+    username = 'testname'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def create_user(self, email=None, authenticated=True):
+        user = USER.objects.create(
+                    email=email or self.email,
+                    password=self.password,
+                    username=self.username,
+                    is_verified=True,
+        )
+        if authenticated:
+            self.client.force_authenticate(user=user)
+        return user
+
+    def create_exercise(self, name='Bench Press'):
+        return Exercise.objects.create(name=name)
+
+    # creates workouts with nested exercise sets and sets for user
+    def create_workouts(self, user, workouts=1, exercise_sets=1, sets=1):
+        exercise = self.create_exercise()
+        created = []
+        for day in range(workouts):
+            workout = Workout.objects.create(
+                        user=user,
+                        date=datetime.date(2021, 1, 1) + datetime.timedelta(days=day),
+            )
+            for _ in range(exercise_sets):
+                exercise_set = ExerciseSet.objects.create(
+                                    user=user,
+                                    workout=workout,
+                                    exercise=exercise,
+                )
+                for reps in range(sets):
+                    Set.objects.create(
+                        user=user,
+                        exercise=exercise_set,
+                        reps=reps + 1,
+                        weight=50,
+                    )
+            created.append(workout)
+        return created
+
+
+class TestBaseTrainingQueryCount(TestBaseTraining):
+    """
+    Base class asserting an endpoint runs a fixed number of queries
+    regardless of how much data it returns
+    """
+    @property
+    def url(self):
+        raise NotImplementedError()
+
+    @property
+    def expected_num_queries(self):
+        raise NotImplementedError()
+
+    # (workouts, exercise sets per workout, sets per exercise set)
+    data_sizes = ((1, 1, 1), (5, 3, 4))
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+
+    def test_should_run_fixed_number_of_queries(self):
+        for workouts, exercise_sets, sets in self.data_sizes:
+            self.create_workouts(self.user, workouts, exercise_sets, sets)
+            # catalog snapshot is rebuilt once per catalog change, not per request
+            catalog.snapshot()
+            with self.assertNumQueries(self.expected_num_queries):
+                response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TestBaseQueryBudget(TestBaseTraining):
+    """
+    Base class requesting an endpoint with cold caches against growing
+    data, views raise QueryBudgetExceeded when over their query budget
+    """
+    # (workouts, exercise sets per workout, sets per exercise set)
+    data_sizes = ((1, 1, 1), (5, 3, 4), (20, 5, 6))
+    expected_status = status.HTTP_200_OK
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(authenticated=False)
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def request(self, size):
+        raise NotImplementedError()
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_should_stay_within_query_budget(self):
+        for size in self.data_sizes:
+            self.workout = self.create_workouts(self.user, *size)[-1]
+            self.exercise_set = self.workout.exerciseset.last()
+            cache.clear()
+            token_cache.clear()
+            response = self.request(size)
+            self.assertEqual(response.status_code, self.expected_status)
+
+
+class TestBaseTrainingPagination(TestBaseTraining):
+    """
+    Base class walking a cursor paginated endpoint page by page
+    """
+    @property
+    def url(self):
+        raise NotImplementedError()
+
+    page_size = 2
+    workouts = 5
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.create_workouts(self.user, self.workouts, exercise_sets=1, sets=1)
+        self.pages = []
+        url = f'{self.url}?page_size={self.page_size}'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.pages.append(response.data['results'])
+            url = response.data['next']
+
+    @property
+    def results(self):
+        return [obj for page in self.pages for obj in page]
+
+    def test_should_split_results_into_pages(self):
+        self.assertEqual(
+            [len(page) for page in self.pages],
+            [self.page_size, self.page_size, self.workouts % self.page_size]
+        )
+
+    def test_should_return_every_object_once_newest_first(self):
+        ids = [obj['id'] for obj in self.results]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), self.workouts)
+
+
+class TestBaseSetBulkCreate(TestBaseTraining):
+    """
+    Base class for creating many sets with a single request
+    """
+    sets = 3
+    valid = True
+
+    def payload(self, exercise_set):
+        payload = [
+            {'exercise': exercise_set.id, 'reps': reps + 1, 'weight': '60.00'}
+            for reps in range(self.sets)
+        ]
+        if not self.valid:
+            payload[-1]['weight'] = 'heavy'
+        return payload
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        workout = self.create_workouts(self.user, workouts=1, exercise_sets=1, sets=0)[0]
+        self.exercise_set = workout.exerciseset.get()
+        self.response = self.client.post(
+                            reverse('training:set-list'),
+                            self.payload(self.exercise_set),
+                            format='json'
+        )
+
+
+class TestBaseWorkoutTree(TestBaseTraining):
+    """
+    Base class for writing a whole workout tree with a single request
+    """
+    exercise_sets = 2
+    sets = 3
+    valid = True
+
+    def payload(self, exercises, date='2021-04-01'):
+        return {
+            'date': date,
+            'exerciseset': [
+                {
+                    'exercise': exercise.id,
+                    'set': [
+                        {'reps': reps + 1, 'weight': '40.50'}
+                        for reps in range(self.sets)
+                    ],
+                }
+                for exercise in exercises[:self.exercise_sets]
+            ],
+        }
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.exercises = [
+            self.create_exercise(f'Exercise {number}') for number in range(self.exercise_sets)
+        ]
+        payload = self.payload(self.exercises)
+        if not self.valid:
+            payload['exerciseset'][-1]['exercise'] = 0
+        self.response = self.client.post(
+                            reverse('training:workout-create-tree'),
+                            payload,
+                            format='json'
+        )
+
+
+class TestBaseTrainingCache(TestBaseTraining):
+    """
+    Base class for cached training responses
+    """
+    @property
+    def url(self):
+        raise NotImplementedError()
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.workout = self.create_workouts(self.user, workouts=2, exercise_sets=1, sets=2)[0]
+        self.response = self.client.get(self.url)
+
+    def test_should_serve_cached_response_with_single_validator_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data, self.response.data)
+
+    def test_should_only_query_etag_validator(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        sql = queries[0]['sql']
+        self.assertIn(f'FROM "{Workout._meta.db_table}"', sql)
+        self.assertIn('COUNT(', sql)
+        self.assertIn('MAX(', sql)
+
+    def test_should_invalidate_on_save(self):
+        Set.objects.filter(user=self.user).update(reps=100)
+        self.assertEqual(self.client.get(self.url).data, self.response.data)
+        # queryset update bypasses signals, saving an instance invalidates
+        Set.objects.filter(user=self.user).first().save()
+        self.assertNotEqual(self.client.get(self.url).data, self.response.data)
+
+    def test_should_invalidate_on_delete(self):
+        self.workout.delete()
+        self.assertNotEqual(self.client.get(self.url).data, self.response.data)
+
+    def test_should_not_share_between_users(self):
+        self.create_user(email='other@email.com')
+        response = self.client.get(self.url)
+        self.assertNotEqual(response.data, self.response.data)
+
+
+class TestBaseTrainingConditional(TestBaseTraining):
+    """
+    Base class for conditional GET of training resources
+    """
+    @property
+    def url(self):
+        raise NotImplementedError()
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.workout = self.create_workouts(self.user, workouts=2, exercise_sets=1, sets=2)[0]
+        self.response = self.client.get(self.url)
+
+    def test_should_return_validators(self):
+        self.assertEqual(self.response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.response['ETag'].startswith('"'))
+        # second precision of HTTP dates can't tell changes apart
+        self.assertNotIn('Last-Modified', self.response)
+
+    def test_should_return_not_modified_for_matching_etag(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], self.response['ETag'])
+
+    def test_should_ignore_if_modified_since(self):
+        Set.objects.filter(user=self.user).last().delete()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_should_change_etag_when_set_changes(self):
+        training_set = Set.objects.filter(user=self.user).first()
+        training_set.reps = 100
+        training_set.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], self.response['ETag'])
+
+    def test_should_change_etag_when_workout_deleted(self):
+        Workout.objects.filter(user=self.user).last().delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.response['ETag'])
+        self.assertNotEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
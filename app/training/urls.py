@@ -8,9 +8,15 @@ router = DefaultRouter()
 router.register('workouts', views.WorkoutView)
 router.register('exercisesets', views.ExerciseSetView)
 router.register('sets', views.SetView)
+router.register('exercises', views.ExerciseCatalogView, basename='exercise')
+router.register('musclegroups', views.MuscleGroupCatalogView, basename='musclegroup')
 
 app_name = 'training'
 
 urlpatterns = [
+    path('export/', views.ExportView.as_view(), name='export'),
+    path('import/', views.ImportView.as_view(), name='import'),
+    path('analytics/volume/', views.ExerciseVolumeView.as_view(), name='analytics-volume'),
+    path('records/', views.PersonalRecordView.as_view(), name='records'),
     path('', include(router.urls)),
 ]
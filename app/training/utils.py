@@ -1,12 +1,36 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, NotSupportedError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import permissions, viewsets
-from training import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from workout.budgets import QueryBudgetMixin
+from training.pagination import TrainingCursorPagination
+from training.filters import QueryParamsFilter
+from training.caching import response_cache_key
+from training.fieldsets import FieldSelection
+from training.catalog import catalog
+from training.models import Workout
 
-class BaseViewTraining(viewsets.ModelViewSet):
+class BaseViewTraining(QueryBudgetMixin, viewsets.ModelViewSet):
     """
     Base view class for training.models to manage objects in database
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TrainingCursorPagination
+    filter_backends = [QueryParamsFilter]
+    # serializer validating filter query parameters and
+    # mapping of its fields to queryset lookups
+    filter_serializer_class = None
+    filter_lookups = {}
+    # read only serializer of .values() rows used by list action
+    values_serializer_class = None
 
     def perform_create(self, serializer):
         """
@@ -14,12 +38,185 @@ class BaseViewTraining(viewsets.ModelViewSet):
         """
         serializer.save(user=self.request.user)
 
+    @property
+    def field_selection(self):
+        """
+        Fields and nested levels requested with ?fields= and ?expand=
+        """
+        return FieldSelection.from_request(self.request)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['field_selection'] = self.field_selection
+        return context
+
     def get_queryset(self):
         """
         Restrict data to be seen by its owner,
         allowing admin to see full data
         """
+        # .all() clones the class-level queryset so prefetched
+        # results are never cached between requests
+        queryset = self.queryset.all()
         if self.request.user.is_superuser:
-            return self.queryset
+            return queryset
+
+        return queryset.filter(user=self.request.user)
+
+    def cached_response(self, action, request, *args, **kwargs):
+        """
+        Serve serialized data from per user cache, cached entries
+        are invalidated by training.signals when user data changes
+        """
+        # admin sees data of every user, so no single generation covers it
+        if request.user.is_superuser:
+            return action(request, *args, **kwargs)
+
+        key = response_cache_key(request.user.id, request.build_absolute_uri())
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = action(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.TRAINING_CACHE_TIMEOUT)
 
-        return self.queryset.filter(user=self.request.user)
+        return response
+
+    def get_etag(self, request):
+        """
+        Return ETag of user training data, workouts are touched whenever
+        their exercise sets or sets change and deleting a workout changes
+        the count. No Last-Modified is sent, HTTP dates have second
+        precision and deletes don't move the newest updated_at, so
+        If-Modified-Since would answer 304 for changed data
+        """
+        state = Workout.objects.filter(user=request.user).aggregate(
+                    count=Count('id'),
+                    last_modified=Max('updated_at')
+        )
+        last_modified = state['last_modified']
+        version = f"{state['count']}:{last_modified and last_modified.isoformat()}"
+        return '"' + hashlib.md5(
+                    f'{version}:{request.build_absolute_uri()}'.encode()
+        ).hexdigest() + '"'
+
+    def conditional_response(self, action, request, *args, **kwargs):
+        """
+        Answer conditional GET with 304 without running serializer
+        """
+        if request.user.is_superuser:
+            return action(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.cached_response(action, request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+
+        return response
+
+    def values_list(self, request, *args, **kwargs):
+        """
+        List objects from .values() rows skipping model instances
+        and per field overhead of model serializer
+        """
+        serializer = self.values_serializer_class(self.field_selection)
+        queryset = serializer.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+
+        return Response(serializer.to_representation(queryset))
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return self.conditional_response(super().list, request, *args, **kwargs)
+        return self.conditional_response(self.values_list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+
+class BaseViewCatalog(viewsets.ViewSet):
+    """
+    Base view class serving read only catalog from in process snapshot,
+    responses are publicly cacheable and ETag changes with catalog version
+    """
+    permission_classes = [permissions.AllowAny]
+    # snapshot attributes holding list and objects by id
+    collection = None
+    collection_by_id = None
+
+    def catalog_response(self, request, snapshot, data):
+        etag = '"' + hashlib.md5(
+                    f'{snapshot.version}:{request.build_absolute_uri()}'.encode()
+        ).hexdigest() + '"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.CATALOG_CACHE_MAX_AGE)
+        patch_vary_headers(response, ('Accept',))
+        return response
+
+    def list(self, request):
+        snapshot = catalog.snapshot()
+        return self.catalog_response(request, snapshot, getattr(snapshot, self.collection))
+
+    def retrieve(self, request, pk=None):
+        snapshot = catalog.snapshot()
+        objects = getattr(snapshot, self.collection_by_id)
+        if not pk.isdigit() or int(pk) not in objects:
+            raise NotFound()
+        return self.catalog_response(request, snapshot, objects[int(pk)])
+
+
+def bulk_create_with_pks(model, objs, batch_size=None):
+    """
+    Insert objects with bulk_create making sure their primary keys are set,
+    must be called inside transaction.atomic()
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=batch_size)
+    # only sqlite holds a database wide write lock for the transaction,
+    # on other backends concurrent inserts interleave with ours
+    if connection.vendor != 'sqlite':
+        raise NotSupportedError(
+            f'{connection.vendor} does not return primary keys from bulk insert'
+        )
+
+    objs = model.objects.bulk_create(objs, batch_size=batch_size)
+    if objs:
+        # backend doesn't return ids from a bulk insert, the write
+        # lock held by the transaction guarantees the newest rows are ours
+        pks = model.objects.order_by('-pk').values_list('pk', flat=True)[:len(objs)]
+        for obj, pk in zip(objs, reversed(pks)):
+            obj.pk = pk
+    return objs
+
+
+def delete_without_signals(queryset):
+    """
+    Delete rows of queryset with a single DELETE, returns number of rows.
+    Unlike QuerySet.delete() nothing is collected, so pre_delete and
+    post_delete aren't sent and on_delete of relations isn't applied
+    """
+    connection = connections[queryset.db]
+    quote_name = connection.ops.quote_name
+    pk = quote_name(queryset.model._meta.pk.column)
+    subquery, params = queryset.values('pk').query.get_compiler(queryset.db).as_sql()
+    # derived table lets MySQL select from the table it deletes from
+    sql = 'DELETE FROM {table} WHERE {pk} IN (SELECT {pk} FROM ({subquery}) {alias})'.format(
+        table=quote_name(queryset.model._meta.db_table),
+        pk=pk,
+        subquery=subquery,
+        alias=quote_name('deleted'),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
@@ -0,0 +1,127 @@
+from rest_framework import serializers
+
+from training.fieldsets import FieldSelection
+from training.serializers import SetSerializer, ExerciseSetSerializer, CatalogExerciseNameField
+
+
+class ValuesSerializer:
+    """
+    Read only serializer building representation straight from .values()
+    rows, output matches model serializer in serializer_class
+    """
+    serializer_class = None
+    # (field name, values lookup, converter) in serializer field order,
+    # converter None uses the serializer field for decimals, dates and
+    # catalog names and passes other values from database as they are
+    columns = ()
+    # nested field name -> ValuesSerializer of its rows
+    nested = {}
+    # lookup of nested row pointing to its parent
+    parent_lookup = None
+
+    def __init__(self, selection=None, path=()):
+        selection = selection or FieldSelection()
+        fields = self.serializer_class().fields
+        self.columns = [
+            (name, lookup, converter or self.get_converter(fields[name]))
+            for name, lookup, converter in type(self).columns
+            if selection.field_allowed(path, name)
+        ]
+        self.nested = [
+            (name, nested_class(selection, path + (name,)))
+            for name, nested_class in type(self).nested.items()
+            if selection.includes(path + (name,))
+        ]
+
+    @staticmethod
+    def get_converter(field):
+        if isinstance(field, (serializers.DecimalField, serializers.DateField, CatalogExerciseNameField)):
+            return field.to_representation
+        return None
+
+    @property
+    def lookups(self):
+        lookups = ['id']
+        if self.parent_lookup:
+            lookups.append(self.parent_lookup)
+        for name, lookup, converter in self.columns:
+            if lookup not in lookups:
+                lookups.append(lookup)
+        return lookups
+
+    def values(self, queryset):
+        """
+        Return rows of queryset needed for representation
+        """
+        return queryset.prefetch_related(None).values(*self.lookups)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        nested = [
+            (name, serializer.by_parent([row['id'] for row in rows]))
+            for name, serializer in self.nested
+        ]
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, converter in self.columns:
+                value = row[lookup]
+                item[name] = value if converter is None else converter(value)
+            for name, children in nested:
+                item[name] = children.get(row['id'], [])
+            data.append(item)
+
+        return data
+
+    def by_parent(self, parent_ids):
+        """
+        Return representations of nested rows grouped by parent id,
+        in one query like prefetch_related
+        """
+        model = self.serializer_class.Meta.model
+        rows = list(self.values(
+                    model._default_manager.filter(**{f'{self.parent_lookup}__in': parent_ids})
+        ))
+
+        children = {}
+        for row, item in zip(rows, self.to_representation(rows)):
+            children.setdefault(row[self.parent_lookup], []).append(item)
+
+        return children
+
+
+class SetValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of SetSerializer
+    """
+    serializer_class = SetSerializer
+    columns = (
+        ('id', 'id', None),
+        ('user_id', 'user_id', None),
+        ('exercise', 'exercise_id', None),
+        ('reps', 'reps', None),
+        ('reps_unit', 'reps_unit', None),
+        ('weight', 'weight', None),
+        ('weight_unit', 'weight_unit', None),
+        ('rest', 'rest', None),
+        ('rest_unit', 'rest_unit', None),
+    )
+    parent_lookup = 'exercise_id'
+
+
+class ExerciseSetValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of ExerciseSetSerializer
+    """
+    serializer_class = ExerciseSetSerializer
+    # string related workout renders __str__ of the related object
+    columns = (
+        ('id', 'id', None),
+        ('user_id', 'user_id', None),
+        ('workout', 'workout__date', str),
+        ('exercise', 'exercise_id', None),
+    )
+    nested = {
+        'set': SetValuesSerializer,
+    }
@@ -1,6 +1,31 @@
-from training.models import Workout, Exercise, ExerciseSet, Set
-from training.utils import BaseViewTraining
+from django.db.models import Prefetch, Q
+from django.http import StreamingHttpResponse
+
+from rest_framework import status, views, permissions, generics
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+
+from training.models import Workout, Exercise, ExerciseSet, Set, PersonalRecord
+from training.utils import BaseViewTraining, BaseViewCatalog
+from training.catalog import catalog
+from training.pagination import WorkoutCursorPagination
 from training import serializers
+from training.values import SetValuesSerializer, ExerciseSetValuesSerializer
+from training.analytics import exercise_volume
+from training.export import EXPORT_FORMATS
+from training.importer import TrainingImporter, IMPORT_FORMATS, import_format, text_lines
+
+
+def owned_exercise_sets(request, **lookups):
+    """
+    Exercise sets of request user, of every user for admin
+    """
+    queryset = ExerciseSet.objects.filter(**lookups)
+    if request.user.is_superuser:
+        return queryset
+    return queryset.filter(user=request.user)
+
 
 class WorkoutView(BaseViewTraining):
     """
@@ -8,18 +33,253 @@ class WorkoutView(BaseViewTraining):
     """
     queryset = Workout.objects.all()
     serializer_class = serializers.WorkoutSerializer
+    pagination_class = WorkoutCursorPagination
+    # cold token and catalog caches included: authentication, validators,
+    # catalog snapshot (3), workouts, exercise sets and sets. Tree writes
+    # add a bulk insert per level, personal records of touched exercises
+    # and reading the tree back, replace also deletes the old tree
+    query_budgets = {
+        'list': 8,
+        'retrieve': 8,
+        'create': 3,
+        'create_tree': 17,
+        'replace_tree': 26,
+    }
+    filter_serializer_class = serializers.DateRangeSerializer
+    filter_lookups = {
+        'date_from': 'date__gte',
+        'date_to': 'date__lte',
+    }
+
+    def get_serializer_class(self):
+        """
+        Use writable nested serializer for workout tree actions
+        """
+        if self.action in ('create_tree', 'replace_tree'):
+            return serializers.WorkoutTreeSerializer
+        return self.serializer_class
+
+    def get_queryset(self):
+        """
+        Prefetch only the levels of the tree that are serialized,
+        WorkoutSerializer -> ExerciseSetSerializer -> SetSerializer
+        """
+        queryset = super().get_queryset()
+        selection = self.field_selection
+        if not selection.includes(('exerciseset',)):
+            return queryset
+
+        # exercise names come from catalog snapshot
+        exercisesets = ExerciseSet.objects.all()
+        if selection.includes(('exerciseset', 'set')):
+            exercisesets = exercisesets.prefetch_related('set')
+        return queryset.prefetch_related(Prefetch('exerciseset', queryset=exercisesets))
+
+    def tree_response(self, workout, status_code):
+        """
+        Return full workout tree read back with the list prefetches
+        """
+        workout = self.get_queryset().get(pk=workout.pk)
+        serializer = serializers.WorkoutSerializer(
+                        workout,
+                        context=self.get_serializer_context()
+        )
+        return Response(serializer.data, status=status_code)
+
+    @action(detail=False, methods=['post'], url_path='tree')
+    def create_tree(self, request):
+        """
+        Create workout with its exercise sets and sets in one request
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        workout = serializer.save(user=request.user)
+
+        return self.tree_response(workout, status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['put'], url_path='tree')
+    def replace_tree(self, request, pk=None):
+        """
+        Replace workout date, exercise sets and sets in one request
+        """
+        serializer = self.get_serializer(self.get_object(), data=request.data)
+        serializer.is_valid(raise_exception=True)
+        workout = serializer.save()
+
+        return self.tree_response(workout, status.HTTP_200_OK)
 
 
 class ExerciseSetView(BaseViewTraining):
     """
     Manage exerciseset in database
     """
-    queryset = ExerciseSet.objects.all()
+    queryset = ExerciseSet.objects.select_related('workout')
     serializer_class = serializers.ExerciseSetSerializer
+    values_serializer_class = ExerciseSetValuesSerializer
+    # authentication, validators, catalog snapshot (3), exercise sets and sets
+    query_budgets = {
+        'list': 7,
+        'retrieve': 7,
+    }
+    filter_serializer_class = serializers.ExerciseSetFilterSerializer
+    filter_lookups = {
+        'exercise': 'exercise',
+        'workout': 'workout',
+    }
+
+    def get_queryset(self):
+        """
+        Prefetch sets only when they are serialized
+        """
+        queryset = super().get_queryset()
+        if self.field_selection.includes(('set',)):
+            queryset = queryset.prefetch_related('set')
+        return queryset
 
 class SetView(BaseViewTraining):
     """
-    Manage exerciseset in database
+    Manage exerciseset in database,
+    a list payload creates many sets at once
     """
     queryset = Set.objects.all()
     serializer_class = serializers.SetSerializer
+    values_serializer_class = SetValuesSerializer
+    # create covers exercise set lookup, inserts, workout touch and
+    # personal record updates, the same for single and list payloads
+    query_budgets = {
+        'list': 3,
+        'retrieve': 3,
+        'create': 11,
+    }
+    filter_serializer_class = serializers.SetFilterSerializer
+    # exercise sets of user are resolved in a subquery by their (user,
+    # exercise) index instead of joined. Sets are then read from user index
+    # in id order matching pagination, so a page needs no sort
+    filter_lookups = {
+        'exercise': lambda exercise, request: Q(
+            exercise__in=owned_exercise_sets(request, exercise=exercise).values('id')
+        ),
+        'exerciseset': 'exercise',
+        'workout': lambda workout, request: Q(
+            exercise__in=owned_exercise_sets(request, workout=workout).values('id')
+        ),
+    }
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Use the bulk list serializer for list payloads
+        """
+        if isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+
+
+class ExerciseCatalogView(BaseViewCatalog):
+    """
+    List exercises with their muscle groups
+    """
+    collection = 'exercises'
+    collection_by_id = 'exercises_by_id'
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Exercises ranked by match of name, or muscle group names
+        with ?muscles=true, to query typed so far (?q=ben)
+        """
+        params = serializers.ExerciseSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        snapshot = catalog.snapshot()
+        exercises = snapshot.search_exercises(**params.validated_data)
+        return self.catalog_response(request, snapshot, exercises)
+
+
+class MuscleGroupCatalogView(BaseViewCatalog):
+    """
+    List muscle groups
+    """
+    collection = 'muscle_groups'
+    collection_by_id = 'muscle_groups_by_id'
+
+
+class ExportView(views.APIView):
+    """
+    Stream full training history of user as NDJSON or CSV
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, format=None):
+        # "format" query parameter is reserved by DRF content negotiation
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"Unknown export type, choose one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(request.user), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="training.{export_format}"'
+
+        return response
+
+
+class ImportView(views.APIView):
+    """
+    Import training history of user from uploaded NDJSON or CSV file
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    parser_classes = (MultiPartParser,)
+
+    def post(self, request, format=None):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['No file was submitted.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        import_type = import_format(request.query_params.get('type') or upload.name)
+        if import_type not in IMPORT_FORMATS:
+            return Response(
+                {'error': f"Unknown import type, choose one of: {', '.join(IMPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        parse = IMPORT_FORMATS[import_type]
+        result = TrainingImporter(request.user).run(parse(text_lines(upload)))
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class ExerciseVolumeView(views.APIView):
+    """
+    Training volume, set count and max weight per exercise
+    aggregated in database over optional date range
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, format=None):
+        params = serializers.DateRangeSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        volume = exercise_volume(request.user, **params.validated_data)
+        serializer = serializers.ExerciseVolumeSerializer(volume, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class PersonalRecordView(generics.ListAPIView):
+    """
+    List personal records of user read from maintained records table,
+    optionally for selected exercises (?exercise=1&exercise=2)
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = serializers.PersonalRecordSerializer
+
+    def get_queryset(self):
+        queryset = PersonalRecord.objects.filter(user=self.request.user)
+        exercises = self.request.query_params.getlist('exercise')
+        if exercises:
+            queryset = queryset.filter(exercise__in=[pk for pk in exercises if pk.isdigit()])
+
+        return queryset.order_by('exercise__name')
@@ -28,3 +28,12 @@ class UserAdmin(BaseUserAdmin):
 
 
 admin.site.register(models.User, UserAdmin)
+
+
+class OutboundEmailAdmin(admin.ModelAdmin):
+    ordering = ['-created_at']
+    list_display = ['subject', 'to_email', 'status', 'attempts', 'created_at']
+    list_filter = ['status']
+
+
+admin.site.register(models.OutboundEmail, OutboundEmailAdmin)
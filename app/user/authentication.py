@@ -0,0 +1,148 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from user.tokens import AUTH_TIME_CLAIM, is_revoked
+
+
+class TokenCache:
+    """
+    Thread safe in process cache of token key -> (user, token, cached at)
+    with time to live and least recently used eviction
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, cached_at, user, token = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user, token, cached_at
+
+    def set(self, key, user, token, cached_at):
+        """
+        Cache user and token read from database at cached_at, wall clock
+        time compared with stale markers of other processes
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, cached_at, user, token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            for key in [key for key, (expires, cached_at, user, token) in self._entries.items()
+                        if user.pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
+
+
+def stale_key(user_id):
+    return f'user:token-cache-stale-before:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drop cached tokens of user in this process and mark entries cached
+    by other processes until now as stale in shared cache
+    """
+    token_cache.delete_user(user_id)
+    # older entries expire by themselves after TOKEN_CACHE_TTL
+    cache.set(stale_key(user_id), time.time(), timeout=settings.TOKEN_CACHE_TTL)
+
+
+def is_stale(user_id, cached_at):
+    stale_before = cache.get(stale_key(user_id))
+    return stale_before is not None and cached_at <= stale_before
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication resolving token -> user from in process cache,
+    so authenticated requests don't query authtoken_token and user_user.
+    When token is deleted or user is saved user.signals drop entries of
+    this process and mark entries of other processes stale in shared
+    cache, which is checked on every cache hit. With per process cache
+    backend (locmem) other processes keep entries until TOKEN_CACHE_TTL
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None and is_stale(cached[0].pk, cached[2]):
+            token_cache.delete(key)
+            cached = None
+
+        if cached is None:
+            # taken before reading, so a marker written while the database
+            # is read marks the entry stale
+            cached_at = time.time()
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, token, cached_at)
+        else:
+            user, token, cached_at = cached
+
+        # copy keeps changes made while handling request out of the cache
+        return copy.copy(user), token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate access tokens issued by LoginView by signature alone,
+    user is rebuilt from token claims without querying database.
+    Revoked tokens are rejected using denylist kept in cache
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if AUTH_TIME_CLAIM not in token:
+            raise InvalidToken(_('Token is not an authentication token'))
+        if is_revoked(token):
+            raise InvalidToken(_('Token has been revoked'))
+
+        return token
+
+    def get_user(self, validated_token):
+        # unsaved instance built from claims, never saved back
+        return get_user_model()(
+            id=validated_token[api_settings.USER_ID_CLAIM],
+            email=validated_token.get('email', ''),
+            is_staff=validated_token.get('is_staff', False),
+            is_superuser=validated_token.get('is_superuser', False),
+            is_verified=True,
+            is_active=True,
+        )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from user.utils import send_queued_emails
+
+
+class Command(BaseCommand):
+    """
+    Drain outbound email queue filled by user.utils.send_email
+    """
+    help = 'Send queued emails in batches, retrying failed ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Emails sent over one connection')
+        parser.add_argument('--max-attempts', type=int, help='Attempts before email is marked failed')
+        parser.add_argument('--loop', action='store_true', help='Keep polling queue')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls when queue is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = send_queued_emails(options['batch_size'], options['max_attempts'])
+            except Exception as error:
+                if not options['loop']:
+                    raise
+                # database hiccup mustn't stop the worker, claimed
+                # emails are retried once their lease expires
+                self.stderr.write(f'Sending queued emails failed: {error}')
+                time.sleep(options['interval'])
+                continue
+            if sent or failed:
+                self.stdout.write(f'{sent} emails sent, {failed} failed')
+            if not options['loop']:
+                break
+            # keep draining without sleeping while there is a backlog
+            if not (sent or failed):
+                time.sleep(options['interval'])
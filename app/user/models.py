@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -53,7 +54,65 @@ class User(AbstractBaseUser, PermissionsMixin):
     objects = UserManager()
     # by default it is user name but we want to change it to email
     USERNAME_FIELD = "email"
+    # fields proving identity or copied into token claims,
+    # issued tokens are revoked when they change
+    CREDENTIAL_FIELDS = ('password', 'is_staff', 'is_superuser')
 
     def __str__(self):
 
         return self.email
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user.saved_credentials = user.get_credentials()
+        return user
+
+    def get_credentials(self):
+        """
+        Loaded values of CREDENTIAL_FIELDS, deferred fields are skipped
+        """
+        return {name: self.__dict__[name] for name in self.CREDENTIAL_FIELDS if name in self.__dict__}
+
+    def credentials_changed(self):
+        """
+        Whether credentials differ from those last loaded or saved,
+        users never loaded from database are assumed changed
+        """
+        saved = getattr(self, 'saved_credentials', None)
+        if saved is None:
+            return True
+        return any(self.__dict__.get(name, value) != value for name, value in saved.items())
+
+
+class OutboundEmail(models.Model):
+    """
+    Email waiting in queue to be sent by send_queued_emails command
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    to_email = models.EmailField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outboundemail_queue_idx'),
+        ]
+
+    def __str__(self):
+
+        return f"{self.subject} to {self.to_email}"
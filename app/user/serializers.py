@@ -2,8 +2,12 @@ from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from user.utils import normalize_email
+from user.tokens import AUTH_TIME_CLAIM, is_revoked
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -77,3 +81,16 @@ class SetNewPasswordSerializer(serializers.Serializer):
                 "Password and confirm_password does not match!"
             )
         return super().validate(attrs)
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Serializer refreshing access token unless user revoked its tokens
+    """
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        if AUTH_TIME_CLAIM not in refresh or is_revoked(refresh):
+            raise InvalidToken('Token has been revoked')
+
+        return super().validate(attrs)
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from user.authentication import token_cache, invalidate_cached_user
+from user.tokens import revoke_user_tokens
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Stop authenticating with token removed on logout
+    """
+    token_cache.delete(instance.key)
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """
+    Drop cached users when they are changed, revoke access tokens of
+    deactivated users and of users whose password or privileges changed,
+    as refresh copies is_staff and is_superuser claims of the old token
+    """
+    invalidate_cached_user(instance.pk)
+    if not instance.is_active or (not created and instance.credentials_changed()):
+        revoke_user_tokens(instance.pk)
+    instance.saved_credentials = instance.get_credentials()
+
+
+@receiver(post_delete, sender=get_user_model())
+def invalidate_deleted_user_tokens(sender, instance, **kwargs):
+    """
+    Stop authenticating deleted users
+    """
+    invalidate_cached_user(instance.pk)
+    revoke_user_tokens(instance.pk)
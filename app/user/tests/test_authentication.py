@@ -0,0 +1,107 @@
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+
+from user.authentication import TokenCache, is_stale, stale_key, token_cache
+from user.tests.utils import TestBaseTokenAuthentication
+
+
+class TestCachedTokenAuthentication(TestBaseTokenAuthentication, TestCase):
+    """
+    Test token is resolved from cache after first request
+    """
+    expected_return_payload = {
+            'email': 'test@email.com',
+            'username': 'testname',
+    }
+
+    def test_should_not_query_token_for_cached_token(self):
+        # user is still fetched by ManageUserView.get_object
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('user:me'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_should_reject_token_after_logout(self):
+        self.client.get(reverse('user:logout'))
+        response = self.client.get(reverse('user:me'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_reject_token_after_deactivation(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('user:me'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_reject_token_cached_by_other_process_after_logout(self):
+        # entry of other process isn't reachable by signals of this one
+        with patch.object(token_cache, 'delete'), patch.object(token_cache, 'delete_user'):
+            self.client.get(reverse('user:logout'))
+        self.assertIsNotNone(token_cache.get(self.token.key))
+
+        response = self.client.get(reverse('user:me'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_reject_token_cached_by_other_process_after_deactivation(self):
+        with patch.object(token_cache, 'delete_user'):
+            self.user.is_active = False
+            self.user.save()
+
+        response = self.client.get(reverse('user:me'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_mark_entry_stale_when_user_saved_while_reading(self):
+        token_cache.clear()
+        authenticate_credentials = TokenAuthentication.authenticate_credentials
+
+        def read_then_save_user(authentication, key):
+            # other process saves user right after its row was read
+            credentials = authenticate_credentials(authentication, key)
+            cache.set(stale_key(self.user.pk), time.time())
+            return credentials
+
+        with patch.object(TokenAuthentication, 'authenticate_credentials', read_then_save_user):
+            self.client.get(reverse('user:me'))
+        self.assertTrue(is_stale(self.user.pk, token_cache.get(self.token.key)[2]))
+
+    def test_should_see_user_changes(self):
+        self.user.username = 'changedname'
+        self.user.save()
+        response = self.client.get(reverse('user:me'))
+        self.assertEqual(response.data['username'], 'changedname')
+
+
+class TestTokenCache(TestCase):
+    """
+    Test token cache expiry and eviction
+    """
+
+    def setUp(self):
+        self.cache = TokenCache(maxsize=2, ttl=60)
+        self.users = [type('User', (), {'pk': pk})() for pk in range(3)]
+
+    def test_should_evict_least_recently_used(self):
+        self.cache.set('a', self.users[0], 'a', time.time())
+        self.cache.set('b', self.users[1], 'b', time.time())
+        self.cache.get('a')
+        self.cache.set('c', self.users[2], 'c', time.time())
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_should_expire_after_ttl(self):
+        self.cache.set('a', self.users[0], 'a', time.time())
+        with patch('user.authentication.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(self.cache.get('a'))
+
+    def test_should_delete_entries_of_user(self):
+        self.cache.set('a', self.users[0], 'a', time.time())
+        self.cache.set('b', self.users[1], 'b', time.time())
+        self.cache.delete_user(0)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('b'))
@@ -0,0 +1,118 @@
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from user.models import OutboundEmail
+from user.utils import send_email, send_queued_emails
+
+
+class TestRegisterQueuesEmail(TestCase):
+    """
+    Test registering user only queues verification email
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.post(reverse('user:register'), {
+            'email': 'test@email.com',
+            'password': 'testpassword',
+            'username': 'testname',
+        })
+
+    def test_should_queue_email_without_sending(self):
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to_email, 'test@email.com')
+        self.assertEqual(email.subject, 'Verify your email')
+        self.assertEqual(email.status, OutboundEmail.PENDING)
+
+    def test_should_send_queued_email_with_command(self):
+        call_command('send_queued_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['test@email.com'])
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.SENT)
+
+
+class TestSendQueuedEmails(TestCase):
+    """
+    Test queue is drained in batches and failed emails retried
+    """
+
+    def setUp(self):
+        for number in range(3):
+            send_email({
+                'email_subject': f'Subject {number}',
+                'email_body': 'Body',
+                'to_email': f'user{number}@email.com',
+            })
+
+    def test_should_send_batch(self):
+        self.assertEqual(send_queued_emails(batch_size=2), (2, 0))
+        self.assertEqual(send_queued_emails(batch_size=2), (1, 0))
+        self.assertEqual(send_queued_emails(batch_size=2), (0, 0))
+        self.assertEqual(len(mail.outbox), 3)
+
+    @patch('django.core.mail.EmailMessage.send', side_effect=OSError('Connection refused'))
+    def test_should_schedule_retry_on_failure(self, send_mocked):
+        self.assertEqual(send_queued_emails(), (0, 3))
+        email = OutboundEmail.objects.first()
+        self.assertEqual(email.status, OutboundEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, 'Connection refused')
+        # retry is not due yet
+        self.assertEqual(send_queued_emails(), (0, 0))
+
+    @patch('django.core.mail.EmailMessage.send', side_effect=OSError('Connection refused'))
+    def test_should_mark_failed_after_max_attempts(self, send_mocked):
+        send_queued_emails(max_attempts=1)
+        self.assertEqual(
+            OutboundEmail.objects.filter(status=OutboundEmail.FAILED).count(), 3
+        )
+
+    @patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=ConnectionRefusedError('Connection refused'))
+    def test_should_schedule_retry_when_server_unreachable(self, open_mocked):
+        self.assertEqual(send_queued_emails(), (0, 3))
+        for email in OutboundEmail.objects.all():
+            self.assertEqual(email.status, OutboundEmail.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, 'Connection refused')
+
+    def test_should_send_outside_transaction(self):
+        # test case itself runs in atomic blocks
+        test_savepoints = len(connection.savepoint_ids)
+        savepoints = []
+        with patch('django.core.mail.EmailMessage.send', side_effect=lambda: savepoints.append(
+            len(connection.savepoint_ids)
+        )):
+            send_queued_emails()
+        self.assertEqual(savepoints, [test_savepoints] * 3)
+
+    def test_should_skip_emails_leased_by_other_worker(self):
+        OutboundEmail.objects.filter(to_email='user0@email.com').update(
+            next_attempt_at=timezone.now() + datetime.timedelta(minutes=5)
+        )
+        self.assertEqual(send_queued_emails(), (2, 0))
+
+
+class TestSendQueuedEmailsCommand(TestCase):
+    """
+    Test polling worker keeps running when sending fails
+    """
+
+    @patch('user.management.commands.send_queued_emails.time.sleep', side_effect=[None, KeyboardInterrupt])
+    @patch('user.management.commands.send_queued_emails.send_queued_emails', side_effect=OSError('database is locked'))
+    def test_should_keep_polling_after_error(self, send_mocked, sleep_mocked):
+        stderr = StringIO()
+        with self.assertRaises(KeyboardInterrupt):
+            call_command('send_queued_emails', loop=True, stderr=stderr)
+        self.assertEqual(send_mocked.call_count, 2)
+        self.assertIn('database is locked', stderr.getvalue())
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.tests.utils import TestBaseJWTLogin
+from user.tokens import issue_token_pair
+
+
+@override_settings(API_AUTH_TOKEN_TYPE='jwt')
+class TestJWTLoginSuccessfull(TestBaseJWTLogin, TestCase):
+    """
+    Test login in jwt mode issues token pair accepted by training api
+    """
+
+    def test_should_return_token_pair(self):
+        self.assertEqual(self.response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(self.response.data), {'access', 'refresh'})
+
+    def test_should_authenticate_without_database(self):
+        # only training validators and sets are queried
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('training:set-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_should_return_user_profile(self):
+        response = self.client.get(reverse('user:me'))
+        self.assertEqual(response.data['email'], self.email)
+
+    def test_should_refresh_access_token(self):
+        response = self.client.post(reverse('user:token-refresh'), {'refresh': self.response.data['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + response.data['access'])
+        self.assertEqual(self.client.get(reverse('training:set-list')).status_code, status.HTTP_200_OK)
+
+    def test_should_revoke_tokens_on_logout(self):
+        self.assertEqual(self.client.get(reverse('user:logout')).status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse('training:set-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('user:token-refresh'), {'refresh': self.response.data['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_accept_new_login_after_logout(self):
+        self.client.get(reverse('user:logout'))
+        client = APIClient()
+        response = client.post(reverse('user:login'), {'email': self.email, 'password': self.password})
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + response.data['access'])
+        self.assertEqual(client.get(reverse('training:set-list')).status_code, status.HTTP_200_OK)
+
+    def test_should_revoke_tokens_on_deactivation(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('training:set-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_revoke_tokens_on_demotion(self):
+        self.user.is_staff = True
+        self.user.save()
+        staff = APIClient().post(reverse('user:login'), {'email': self.email, 'password': self.password})
+
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.is_staff = False
+        user.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + staff.data['access'])
+        response = self.client.get(reverse('training:set-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('user:token-refresh'), {'refresh': staff.data['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_revoke_tokens_on_password_change(self):
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.set_password('changedpassword')
+        user.save()
+        response = self.client.get(reverse('training:set-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_keep_tokens_on_profile_change(self):
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.username = 'changedname'
+        user.save()
+        self.assertEqual(self.client.get(reverse('training:set-list')).status_code, status.HTTP_200_OK)
+
+    def test_should_reject_email_link_token(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(token))
+        response = self.client.get(reverse('training:set-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_refuse_login_when_logged_in(self):
+        response = self.client.post(reverse('user:login'), {'email': self.email, 'password': self.password})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestJWTDisabled(TestCase):
+    """
+    Test access tokens aren't accepted in default "token" mode
+    """
+
+    def test_should_reject_access_token(self):
+        user = get_user_model().objects.create_user(email='test@email.com', password='testpassword')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + issue_token_pair(user)['access'])
+        response = client.get(reverse('training:set-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,111 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.tests.utils import TestBaseQueryBudget
+from user.tokens import issue_token_pair
+
+
+class TestRegisterBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test register stays within query budget
+    """
+    expected_status = status.HTTP_201_CREATED
+
+    def request(self, count):
+        return self.client.post(reverse('user:register'), {
+            'email': f'register{count}@email.com',
+            'password': self.password,
+            'username': self.username,
+        })
+
+
+class TestVerifyEmailBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test email verification stays within query budget
+    """
+
+    def request(self, count):
+        token = RefreshToken.for_user(self.user).access_token
+        return self.client.get(reverse('user:email-verify') + f'?token={token}')
+
+
+class TestLoginBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test login stays within query budget
+    """
+
+    def request(self, count):
+        return self.client.post(reverse('user:login'), {
+            'email': self.email,
+            'password': self.password,
+        })
+
+
+class TestLogoutBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test logout stays within query budget
+    """
+
+    def request(self, count):
+        self.authenticate()
+        return self.client.get(reverse('user:logout'))
+
+
+class TestRetrieveUserBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test retrieving user stays within query budget
+    """
+
+    def request(self, count):
+        self.authenticate()
+        return self.client.get(reverse('user:me'))
+
+
+class TestUpdateUserBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test changing user password stays within query budget
+    """
+
+    def request(self, count):
+        self.authenticate()
+        return self.client.patch(reverse('user:me'), {
+            'email': self.email,
+            'password': f'newpassword{count}',
+        })
+
+
+class TestPasswordResetEmailBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test password reset email stays within query budget
+    """
+
+    def request(self, count):
+        return self.client.post(reverse('user:password-reset-email'), {'email': self.email})
+
+
+class TestPasswordResetBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test password reset stays within query budget
+    """
+
+    def request(self, count):
+        token = RefreshToken.for_user(self.user).access_token
+        url = reverse('user:password-reset-confirm', kwargs={'token': token})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        return self.client.post(url, {
+            'password': 'newpassword',
+            'password_confirmation': 'newpassword',
+        })
+
+
+class TestTokenRefreshBudget(TestBaseQueryBudget, TestCase):
+    """
+    Test token refresh stays within query budget
+    """
+
+    def request(self, count):
+        refresh = issue_token_pair(self.user)['refresh']
+        return self.client.post(reverse('user:token-refresh'), {'refresh': refresh})
@@ -0,0 +1,117 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user.throttling import take_token, local_buckets
+
+
+class TestTokenBucket(TestCase):
+    """
+    Test bucket refills at capacity per period
+    """
+
+    def test_should_take_tokens_until_empty(self):
+        state = None
+        for _ in range(3):
+            state, wait = take_token(state, 0, capacity=3, period=60)
+            self.assertEqual(wait, 0)
+        state, wait = take_token(state, 0, capacity=3, period=60)
+        self.assertEqual(wait, 20)
+
+    def test_should_refill_over_time(self):
+        state = (0, 0)
+        state, wait = take_token(state, 10, capacity=3, period=60)
+        self.assertEqual(wait, 10)
+        state, wait = take_token(state, 20, capacity=3, period=60)
+        self.assertEqual(wait, 0)
+
+
+@override_settings(AUTH_THROTTLE_RATES={
+    'login': {'ip': '5/min', 'email': '2/min'},
+    'register': {'ip': '2/hour'},
+    'password_reset': {'email': '1/hour'},
+})
+class TestAuthThrottling(TestCase):
+    """
+    Test login, registration and password reset are throttled
+    per client address and per email before any work is done
+    """
+
+    def setUp(self):
+        cache.clear()
+        local_buckets.clear()
+        self.client = APIClient()
+
+    def login(self, email, address='10.0.0.1'):
+        return self.client.post(
+                    reverse('user:login'),
+                    {'email': email, 'password': 'wrongpassword'},
+                    REMOTE_ADDR=address
+        )
+
+    def test_should_throttle_login_per_email(self):
+        for _ in range(2):
+            self.assertEqual(self.login('user@email.com').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with patch('user.views.authenticate') as authenticate, self.assertNumQueries(0):
+            response = self.login('USER@email.com')
+        authenticate.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '30')
+
+        self.assertEqual(self.login('other@email.com').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_should_throttle_login_per_address(self):
+        for number in range(5):
+            self.login(f'user{number}@email.com')
+        self.assertEqual(self.login('new@email.com').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(
+            self.login('new@email.com', address='10.0.0.2').status_code,
+            status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_should_ignore_spoofed_forwarded_for(self):
+        for number in range(5):
+            self.client.post(
+                reverse('user:login'),
+                {'email': f'user{number}@email.com', 'password': 'wrongpassword'},
+                REMOTE_ADDR='10.0.0.1',
+                HTTP_X_FORWARDED_FOR=f'192.168.0.{number}'
+            )
+        response = self.client.post(
+                    reverse('user:login'),
+                    {'email': 'new@email.com', 'password': 'wrongpassword'},
+                    REMOTE_ADDR='10.0.0.1',
+                    HTTP_X_FORWARDED_FOR='192.168.0.100'
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @patch('user.views.send_email_verify')
+    def test_should_throttle_registration(self, send_email_verify):
+        for number in range(3):
+            response = self.client.post(reverse('user:register'), {
+                'email': f'user{number}@email.com',
+                'password': 'testpassword',
+                'username': 'testname',
+            })
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(send_email_verify.call_count, 2)
+
+    def test_should_throttle_password_reset(self):
+        url = reverse('user:password-reset-email')
+        self.client.post(url, {'email': 'user@email.com'})
+        response = self.client.post(url, {'email': 'user@email.com'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_should_fall_back_to_local_buckets(self):
+        with patch('user.throttling.cache.get', side_effect=ConnectionError), \
+                self.assertLogs('user.throttling', 'WARNING'):
+            for _ in range(2):
+                self.login('user@email.com')
+            response = self.login('user@email.com')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
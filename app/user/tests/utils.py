@@ -1,13 +1,18 @@
 from django.urls import reverse
 from unittest.mock import patch
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
 
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework.authtoken.models import Token
+from rest_framework.views import APIView
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from user.authentication import CachedTokenAuthentication, StatelessJWTAuthentication, token_cache
+
 
 USER = get_user_model()
 
@@ -250,3 +255,98 @@ class TestBaseUserResetPasswordConfirm(TestBase):
             self.response = self.client.post(reverse('user:password-reset-confirm', args=[self.token_verification]), self.password_reset)
         else:
             self.response = self.client.post(reverse('user:password-reset-confirm', args=['INVALID_TOKEN']), self.password_reset)
+
+
+class TestBaseTokenAuthentication(TestBase):
+    """
+    Base test for authenticating requests with cached token
+    """
+    email = 'test@email.com'
+    password = 'testpassword'
+    username = 'testname'
+
+    def setUp(self):
+        token_cache.clear()
+        self.client = APIClient()
+        self.user = USER.objects.create_user(
+                        email=self.email,
+                        password=self.password,
+                        username=self.username,
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.response = self.client.get(reverse('user:me'))
+
+
+class TestBaseJWTLogin:
+    """
+    Base test for login with stateless access and refresh tokens
+    """
+    email = 'test@email.com'
+    password = 'testpassword'
+    username = 'testname'
+
+    def setUp(self):
+        cache.clear()
+        # views copy authentication classes of "jwt" mode settings when defined
+        patcher = patch.object(APIView, 'authentication_classes', (
+                        CachedTokenAuthentication,
+                        StatelessJWTAuthentication,
+        ))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.user = USER.objects.create_user(
+                        email=self.email,
+                        password=self.password,
+                        username=self.username,
+                        is_verified=True,
+        )
+        self.response = self.client.post(reverse('user:login'), {
+            'email': self.email,
+            'password': self.password,
+        })
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.response.data.get('access', ''))
+
+
+class TestBaseQueryBudget:
+    """
+    Base class requesting user endpoint with cold token cache as number
+    of users grows, views raise QueryBudgetExceeded over their query budget
+    """
+    email = 'test@email.com'
+    password = 'testpassword'
+    username = 'testname'
+    user_counts = (1, 10, 50)
+    expected_status = status.HTTP_200_OK
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = USER.objects.create_user(
+                        email=self.email,
+                        password=self.password,
+                        username=self.username,
+                        is_verified=True,
+        )
+
+    def authenticate(self):
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def request(self, count):
+        raise NotImplementedError()
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_should_stay_within_query_budget(self):
+        created = 1
+        for count in self.user_counts:
+            USER.objects.bulk_create([
+                USER(email=f'user{index}@email.com', username='user', password='password')
+                for index in range(created, count)
+            ])
+            created = count
+            token_cache.clear()
+            response = self.request(count)
+            self.assertEqual(response.status_code, self.expected_status)
+
@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework.throttling import BaseThrottle
+
+
+logger = logging.getLogger(__name__)
+
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_rate(rate):
+    """
+    Bucket capacity and seconds to refill it from "5/min"
+    """
+    capacity, period = rate.split('/')
+    return int(capacity), PERIODS[period]
+
+
+def take_token(state, now, capacity, period):
+    """
+    Refill bucket state (tokens, updated) for time passed and take a
+    token, returns new state and seconds to wait when bucket is empty
+    """
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens < 1:
+        return (tokens, now), (1 - tokens) * period / capacity
+    return (tokens - 1, now), 0
+
+
+class LocalBuckets:
+    """
+    Thread safe in process token buckets with least recently used
+    eviction, used when shared cache isn't reachable
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        with self._lock:
+            state, wait = take_token(self._buckets.get(key), time.time(), capacity, period)
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+local_buckets = LocalBuckets(settings.AUTH_THROTTLE_LOCAL_SIZE)
+
+
+def take(key, capacity, period):
+    """
+    Take token from bucket in shared cache, or in process bucket when
+    cache fails. Cache read and write aren't atomic, so concurrent
+    requests may take the same token, which lets a few more through
+    """
+    try:
+        state, wait = take_token(cache.get(key), time.time(), capacity, period)
+        # unused bucket expires once it would be full again
+        cache.set(key, state, period)
+        return wait
+    except Exception:
+        logger.warning('Throttle cache unavailable, using local buckets', exc_info=True)
+        return local_buckets.take(key, capacity, period)
+
+
+class BucketThrottle(BaseThrottle):
+    """
+    Token bucket throttle of view's throttle_scope, rates are read from
+    settings.AUTH_THROTTLE_RATES[scope][kind] as "capacity/period"
+    """
+    kind = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError()
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        scope = getattr(view, 'throttle_scope', None)
+        rate = settings.AUTH_THROTTLE_RATES.get(scope, {}).get(self.kind)
+        ident = self.get_ident_key(request)
+        if rate is None or not ident:
+            return True
+
+        capacity, period = parse_rate(rate)
+        digest = hashlib.md5(ident.encode()).hexdigest()
+        self.wait_seconds = take(f'throttle:{scope}:{self.kind}:{digest}', capacity, period)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPBucketThrottle(BucketThrottle):
+    """
+    Throttle requests by client address, X-Forwarded-For is only
+    trusted for REST_FRAMEWORK['NUM_PROXIES'] proxies
+    """
+    kind = 'ip'
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class EmailBucketThrottle(BucketThrottle):
+    """
+    Throttle requests by email address in request data,
+    regardless of its case
+    """
+    kind = 'email'
+
+    def get_ident_key(self, request):
+        email = request.data.get('email')
+        if not isinstance(email, str):
+            return None
+        return email.strip().lower()
+
+
+class AuthThrottleMixin:
+    """
+    View mixin throttling by client address and email before
+    authentication, so that rejected requests never query tokens,
+    hash passwords or send mail
+    """
+    throttle_classes = (IPBucketThrottle, EmailBucketThrottle)
+    throttle_scope = None
+
+    def initial(self, request, *args, **kwargs):
+        self.check_throttles(request)
+        self.throttles_checked = True
+        super().initial(request, *args, **kwargs)
+
+    def check_throttles(self, request):
+        if not getattr(self, 'throttles_checked', False):
+            super().check_throttles(request)
@@ -0,0 +1,49 @@
+import time
+
+from django.core.cache import cache
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# claim marking tokens issued by LoginView, tokens sent in email links
+# are signed with the same key but never carry it
+AUTH_TIME_CLAIM = 'auth_time'
+
+
+def revoked_key(user_id):
+    return f'user:jwt-revoked-before:{user_id}'
+
+
+def issue_token_pair(user):
+    """
+    Issue refresh token and short lived access token for API authentication,
+    access token carries claims needed to rebuild user without database
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh[AUTH_TIME_CLAIM] = time.time()
+    refresh['email'] = user.email
+    refresh['is_staff'] = user.is_staff
+    refresh['is_superuser'] = user.is_superuser
+
+    return {'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+
+def revoke_user_tokens(user_id):
+    """
+    Revoke every token pair issued to user so far, entry lives
+    only as long as the longest lived token it could reject
+    """
+    cache.set(
+        revoked_key(user_id),
+        time.time(),
+        timeout=int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    )
+
+
+def is_revoked(token):
+    """
+    Check token against denylist of per user revocation times
+    """
+    revoked_before = cache.get(revoked_key(token[api_settings.USER_ID_CLAIM]))
+    return revoked_before is not None and token[AUTH_TIME_CLAIM] <= revoked_before
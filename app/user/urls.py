@@ -7,6 +7,7 @@ app_name = 'user'
 urlpatterns = [
     path('login/', views.LoginView.as_view(), name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
+    path('token/refresh/', views.TokenRefreshView.as_view(), name='token-refresh'),
     path('me/', views.ManageUserView.as_view(), name='me'),
     path('register/', views.RegisterUserView.as_view(), name='register'),
     path('email-verify/', views.VerifyEmailView.as_view(), name='email-verify'),
@@ -1,4 +1,8 @@
-from django.core.mail import EmailMessage
+import datetime
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.auth import get_user_model
@@ -10,15 +14,118 @@ from rest_framework.response import Response
 from rest_framework import status
 import jwt
 
+from user.models import OutboundEmail
+from user.tokens import revoke_user_tokens
 
-def send_email(data):
 
-    email = EmailMessage(
+def send_email(data):
+    """
+    Put email in outbound queue, emails are sent
+    by send_queued_emails command outside of request
+    """
+    OutboundEmail.objects.create(
         subject=data['email_subject'],
         body=data['email_body'],
-        to=[data['to_email']]
+        to_email=data['to_email']
     )
-    email.send()
+
+
+def claim_queued_emails(batch_size):
+    """
+    Lease batch of due emails to this worker in a short transaction,
+    emails of a worker that dies while sending become due after lease
+    """
+    now = timezone.now()
+    # microsecond precision makes lease identify emails claimed by this call
+    lease = now + datetime.timedelta(seconds=settings.EMAIL_QUEUE_LEASE)
+    with transaction.atomic():
+        queued = OutboundEmail.objects.filter(
+                    status=OutboundEmail.PENDING,
+                    next_attempt_at__lte=now
+        ).order_by('next_attempt_at')
+        if connection.features.has_select_for_update_skip_locked:
+            # concurrent workers skip emails claimed by each other
+            queued = queued.select_for_update(skip_locked=True)
+        pks = list(queued.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return []
+        # emails leased by another worker since they were read are not due
+        OutboundEmail.objects.filter(
+            pk__in=pks,
+            status=OutboundEmail.PENDING,
+            next_attempt_at__lte=now
+        ).update(next_attempt_at=lease)
+
+    return list(OutboundEmail.objects.filter(pk__in=pks, next_attempt_at=lease))
+
+
+def schedule_retry(email, error, max_attempts):
+    """
+    Record failed attempt, retrying with exponential backoff
+    until max_attempts is reached
+    """
+    email.last_error = str(error)
+    if email.attempts >= max_attempts:
+        email.status = OutboundEmail.FAILED
+    else:
+        email.next_attempt_at = timezone.now() + datetime.timedelta(
+                                    seconds=settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (email.attempts - 1)
+        )
+
+
+def send_queued_emails(batch_size=None, max_attempts=None):
+    """
+    Send batch of due queued emails over one connection,
+    failed emails are retried with exponential backoff.
+    Emails are sent outside of transaction so that slow
+    SMTP server doesn't hold database locks
+    """
+    batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    max_attempts = max_attempts or settings.EMAIL_QUEUE_MAX_ATTEMPTS
+    sent = failed = 0
+
+    queued = claim_queued_emails(batch_size)
+    if not queued:
+        return sent, failed
+
+    for email in queued:
+        email.attempts += 1
+
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+    except Exception as error:
+        # server unreachable, attempt failed for the whole batch
+        for email in queued:
+            schedule_retry(email, error, max_attempts)
+        failed = len(queued)
+    else:
+        try:
+            for email in queued:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    to=[email.to_email],
+                    connection=mail_connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    failed += 1
+                    schedule_retry(email, error, max_attempts)
+                else:
+                    sent += 1
+                    email.status = OutboundEmail.SENT
+                    email.sent_at = timezone.now()
+        finally:
+            mail_connection.close()
+
+    OutboundEmail.objects.bulk_update(
+        queued,
+        ['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at']
+    )
+
+    return sent, failed
 
 def send_email_verify(user, request, changed_email=None):
     """
@@ -101,6 +208,7 @@ def decode_token_to_get_user(token, request, new_password=None):
         if request.method == 'POST' and new_password:
             user.set_password(new_password)
             user.save()
+            revoke_user_tokens(user.pk)
             return Response({'success': 'Password reset successfully!'}, status=status.HTTP_200_OK)
 
         return Response({'success': 'Reset your password'}, status=status.HTTP_200_OK)
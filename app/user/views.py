@@ -3,11 +3,15 @@ from django.contrib.auth import get_user_model, authenticate
 from django.conf import settings
 
 from rest_framework.response import Response
-from rest_framework import generics, views, status, permissions, authentication
+from rest_framework import generics, views, status, permissions
 from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.views import TokenRefreshView as BaseTokenRefreshView
 import jwt
 
+from workout.budgets import QueryBudgetMixin
+from user.throttling import AuthThrottleMixin
 from user import serializers
+from user.tokens import issue_token_pair, revoke_user_tokens
 from user.utils import (send_email_verify,
                         send_email_password_reset,
                         normalize_email,
@@ -15,10 +19,12 @@ from user.utils import (send_email_verify,
                         )
 
 
-class RegisterUserView(generics.GenericAPIView):
+class RegisterUserView(QueryBudgetMixin, AuthThrottleMixin, generics.GenericAPIView):
     """
     Register a new user in the system
     """
+    query_budgets = {'post': 5}
+    throttle_scope = 'register'
     permission_classes = (permissions.AllowAny,)
     serializer_class = serializers.UserSerializer
 
@@ -39,10 +45,11 @@ class RegisterUserView(generics.GenericAPIView):
         )
 
 
-class VerifyEmailView(views.APIView):
+class VerifyEmailView(QueryBudgetMixin, views.APIView):
     """
     Verify a user by email with sent token
     """
+    query_budgets = {'get': 2}
     permission_classes = (permissions.AllowAny,)
     serializer_class = serializers.EmailVerificationSerializer
 
@@ -71,10 +78,13 @@ class VerifyEmailView(views.APIView):
             return Response({'error': 'Invalid token'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LoginView(views.APIView):
+class LoginView(QueryBudgetMixin, AuthThrottleMixin, views.APIView):
     """
     Login user into the system and create token for user
     """
+    # user, then token lookup and creation
+    query_budgets = {'post': 3}
+    throttle_scope = 'login'
     permission_classes = (permissions.AllowAny,)
     serializer_class = serializers.LoginSerializer
 
@@ -92,6 +102,8 @@ class LoginView(views.APIView):
             if user:
                 if user.is_verified or user.is_superuser:
                     if user.is_active:
+                        if settings.API_AUTH_TOKEN_TYPE == 'jwt':
+                            return self.jwt_response(request, user)
                         token, created = Token.objects.get_or_create(user=user)
                         # if user is already logged in
                         if token.key == str(request.auth):
@@ -117,31 +129,46 @@ class LoginView(views.APIView):
             return Response(serializer.errors,
                             status=status.HTTP_400_BAD_REQUEST)
 
+    def jwt_response(self, request, user):
+        """
+        Issue access and refresh token pair for user
+        """
+        # if user is already logged in with access token
+        if request.user.is_authenticated and request.user.pk == user.pk:
+            return Response({'detail': 'You are already logged in.'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        return Response(issue_token_pair(user), status=status.HTTP_200_OK)
+
 
-class LogoutView(views.APIView):
+class LogoutView(QueryBudgetMixin, views.APIView):
     """
     Logout user deletting token in the database
+    and revoking issued access and refresh tokens
     """
-    authentication_classes = (authentication.TokenAuthentication,)
+    query_budgets = {'get': 3}
     permission_classes = (permissions.IsAuthenticated,)
 
     def get(self, request, format=None):
         """
-        Remove all auth tokens owned by request.user.
+        Remove all auth tokens owned by request.user,
+        deleting token also removes it from token cache
         """
         tokens = Token.objects.filter(user=request.user)
         for token in tokens:
             token.delete()
+        revoke_user_tokens(request.user.pk)
         content = {'success': f"User {request.user} has logged out successfully."}
         return Response(content, status=status.HTTP_200_OK)
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(QueryBudgetMixin, generics.RetrieveUpdateAPIView):
     """
     Manage the authenticated user
     """
+    # password change saves user once more
+    query_budgets = {'get': 2, 'put': 6, 'patch': 6}
     serializer_class = serializers.UserSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated),
 
     def get_object(self):
@@ -149,7 +176,7 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         Retrieve and return authenticated user
         """
         # sending email verification if user updated email
-        user = get_object_or_404(get_user_model(), email=self.request.user.email)
+        user = get_object_or_404(get_user_model(), pk=self.request.user.pk)
         if user.email != self.request.data.get('email'):
             changed_email = normalize_email(self.request.data.get('email'))
             if changed_email != None:
@@ -160,10 +187,12 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         return user
 
 
-class PasswordResetEmail(generics.GenericAPIView):
+class PasswordResetEmail(QueryBudgetMixin, AuthThrottleMixin, generics.GenericAPIView):
     """
     Password reset email for the user
     """
+    query_budgets = {'post': 3}
+    throttle_scope = 'password_reset'
     permission_classes = (permissions.AllowAny,)
     serializer_class = serializers.ResetPasswordEmailSerializer
 
@@ -183,11 +212,12 @@ class PasswordResetEmail(generics.GenericAPIView):
                     )
 
 
-class PasswordResetView(generics.GenericAPIView):
+class PasswordResetView(QueryBudgetMixin, generics.GenericAPIView):
     """
     Checking sent token to reset password
     and setting new password for user
     """
+    query_budgets = {'get': 1, 'post': 2}
     permission_classes = (permissions.AllowAny,)
     serializer_class = serializers.SetNewPasswordSerializer
 
@@ -212,3 +242,12 @@ class PasswordResetView(generics.GenericAPIView):
         response = decode_token_to_get_user(token, request, password)
 
         return response
+
+
+class TokenRefreshView(QueryBudgetMixin, BaseTokenRefreshView):
+    """
+    Issue new access token for refresh token that wasn't revoked
+    """
+    # refresh is verified by signature and revocation cutoff in cache
+    query_budgets = {'post': 0}
+    serializer_class = serializers.TokenRefreshSerializer
@@ -0,0 +1,63 @@
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    View ran more SQL queries than its budget allows
+    """
+
+
+# transaction control depends on whether the request already runs
+# in a transaction (tests, ATOMIC_REQUESTS), so it isn't counted
+TRANSACTION_STATEMENTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK', 'BEGIN', 'COMMIT')
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting executed queries
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    """
+    View mixin enforcing maximum number of SQL queries of a request,
+    query_budgets maps viewset action or lower case HTTP method of
+    plain views to its budget. Requests over budget are logged, or
+    raise QueryBudgetExceeded when settings.QUERY_BUDGET_RAISE is set
+    """
+    query_budgets = {}
+
+    def get_query_budget(self, request):
+        action = getattr(self, 'action', None) or request.method.lower()
+        return action, self.query_budgets.get(action)
+
+    def dispatch(self, request, *args, **kwargs):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = super().dispatch(request, *args, **kwargs)
+
+        action, budget = self.get_query_budget(request)
+        if budget is not None and counter.count > budget:
+            message = (
+                f'{type(self).__name__}.{action} ran {counter.count} queries, '
+                f'budget is {budget}: {request.method} {request.path}'
+            )
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
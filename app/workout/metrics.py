@@ -0,0 +1,257 @@
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# separator of label values in store keys
+SEPARATOR = '|'
+
+# metrics of stopped processes folded together by collect()
+STOPPED_FILE = 'stopped.json'
+
+
+def empty_histogram(buckets):
+    return {'buckets': [0] * len(buckets), 'sum': 0, 'count': 0}
+
+
+def observe_histogram(histogram, buckets, value):
+    """
+    Add value to cumulative bucket counts, sum and count of histogram
+    """
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            histogram['buckets'][index] += 1
+    histogram['sum'] += value
+    histogram['count'] += 1
+
+
+def merge_histogram(total, histogram):
+    for index, count in enumerate(histogram['buckets']):
+        total['buckets'][index] += count
+    total['sum'] += histogram['sum']
+    total['count'] += histogram['count']
+
+
+def empty_metrics():
+    return {
+        'requests': {},
+        'latency': {},
+        'sql_queries': {},
+        'sql_seconds': {},
+        'response_size': {},
+    }
+
+
+def merge_metrics(total, data):
+    for metric in ('requests', 'sql_queries', 'sql_seconds'):
+        for key, value in data[metric].items():
+            total[metric][key] = total[metric].get(key, 0) + value
+    for metric, buckets in (('latency', LATENCY_BUCKETS), ('response_size', SIZE_BUCKETS)):
+        for key, histogram in data[metric].items():
+            merge_histogram(total[metric].setdefault(key, empty_histogram(buckets)), histogram)
+
+
+def write_file(path, content):
+    # write and rename so readers never see a partial file
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'w') as output_file:
+        output_file.write(content)
+    os.replace(temporary_path, path)
+
+
+def read_json(path):
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return None
+
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsRegistry:
+    """
+    Thread safe in process request metrics, periodically written to
+    a file per process in settings.METRICS_DIR so that every worker's
+    metrics can be aggregated by the metrics endpoint. File is named
+    "<pid>-<random id>.json", so a process reusing pid of a stopped
+    one never overwrites its counters
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_flush = 0
+        self._pid = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.data = empty_metrics()
+
+    def observe(self, route, method, status, seconds, queries, sql_seconds, size=None):
+        key = SEPARATOR.join((route, method))
+        status_key = SEPARATOR.join((route, method, str(status)))
+        with self._lock:
+            data = self.data
+            data['requests'][status_key] = data['requests'].get(status_key, 0) + 1
+            observe_histogram(
+                data['latency'].setdefault(key, empty_histogram(LATENCY_BUCKETS)),
+                LATENCY_BUCKETS,
+                seconds
+            )
+            data['sql_queries'][key] = data['sql_queries'].get(key, 0) + queries
+            data['sql_seconds'][key] = data['sql_seconds'].get(key, 0) + sql_seconds
+            if size is not None:
+                observe_histogram(
+                    data['response_size'].setdefault(key, empty_histogram(SIZE_BUCKETS)),
+                    SIZE_BUCKETS,
+                    size
+                )
+
+    def path(self):
+        # workers forked after import get a file of their own
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid = pid
+            self._name = f'{pid}-{uuid.uuid4().hex}.json'
+        return os.path.join(settings.METRICS_DIR, self._name)
+
+    def flush(self, force=False):
+        """
+        Write metrics of this process to its file at most once per
+        settings.METRICS_FLUSH_INTERVAL seconds
+        """
+        now = time.monotonic()
+        if not force and now - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+
+        with self._lock:
+            content = json.dumps(self.data)
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        write_file(self.path(), content)
+
+
+registry = MetricsRegistry()
+
+
+def fold_stopped(directory):
+    """
+    Merge files of stopped processes into STOPPED_FILE and remove them,
+    returns metrics of all stopped processes. Merged names are kept
+    until their files are gone, so a file left behind by an interrupted
+    fold is never counted twice
+    """
+    stopped_path = os.path.join(directory, STOPPED_FILE)
+    stopped = read_json(stopped_path) or {'metrics': empty_metrics(), 'merged': []}
+    names = set(os.listdir(directory))
+    merged = [name for name in stopped['merged'] if name in names]
+    for name in sorted(names - set(merged)):
+        pid = name.split('-')[0].split('.')[0]
+        if not name.endswith('.json') or not pid.isdigit() or is_running(int(pid)):
+            continue
+        data = read_json(os.path.join(directory, name))
+        if data is not None:
+            merge_metrics(stopped['metrics'], data)
+            merged.append(name)
+
+    if merged != stopped['merged']:
+        stopped['merged'] = merged
+        write_file(stopped_path, json.dumps(stopped))
+    for name in merged:
+        os.remove(os.path.join(directory, name))
+    return stopped['metrics']
+
+
+def collect():
+    """
+    Sum metrics of all processes, files of stopped workers are folded
+    into STOPPED_FILE so counters never go backwards. Runs under a lock
+    file as workers answering /metrics at once would fold the same files
+    """
+    total = empty_metrics()
+    if not os.path.isdir(settings.METRICS_DIR):
+        return total
+
+    with open(os.path.join(settings.METRICS_DIR, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        merge_metrics(total, fold_stopped(settings.METRICS_DIR))
+        for name in os.listdir(settings.METRICS_DIR):
+            if not name.endswith('.json') or name == STOPPED_FILE:
+                continue
+            data = read_json(os.path.join(settings.METRICS_DIR, name))
+            if data is not None:
+                merge_metrics(total, data)
+
+    return total
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labels(key, names, **extra):
+    values = dict(zip(names, key.split(SEPARATOR)), **extra)
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in values.items()) + '}'
+
+
+def histogram_lines(name, histograms, buckets):
+    for key, histogram in sorted(histograms.items()):
+        for bound, count in zip(buckets, histogram['buckets']):
+            yield f"{name}_bucket{labels(key, ('route', 'method'), le=repr(float(bound)))} {count}"
+        yield f"{name}_bucket{labels(key, ('route', 'method'), le='+Inf')} {histogram['count']}"
+        yield f"{name}_sum{labels(key, ('route', 'method'))} {histogram['sum']}"
+        yield f"{name}_count{labels(key, ('route', 'method'))} {histogram['count']}"
+
+
+def exposition(data):
+    """
+    Render collected metrics in Prometheus text exposition format
+    """
+    lines = [
+        '# HELP http_requests_total Requests by route, method and status code.',
+        '# TYPE http_requests_total counter',
+    ]
+    for key, count in sorted(data['requests'].items()):
+        lines.append(f"http_requests_total{labels(key, ('route', 'method', 'status'))} {count}")
+
+    lines += [
+        '# HELP http_request_duration_seconds Request latency by route and method.',
+        '# TYPE http_request_duration_seconds histogram',
+        *histogram_lines('http_request_duration_seconds', data['latency'], LATENCY_BUCKETS),
+        '# HELP http_request_sql_queries_total SQL queries run by requests.',
+        '# TYPE http_request_sql_queries_total counter',
+    ]
+    for key, count in sorted(data['sql_queries'].items()):
+        lines.append(f"http_request_sql_queries_total{labels(key, ('route', 'method'))} {count}")
+
+    lines += [
+        '# HELP http_request_sql_seconds_total Time spent in SQL queries by requests.',
+        '# TYPE http_request_sql_seconds_total counter',
+    ]
+    for key, seconds in sorted(data['sql_seconds'].items()):
+        lines.append(f"http_request_sql_seconds_total{labels(key, ('route', 'method'))} {seconds}")
+
+    lines += [
+        '# HELP http_response_size_bytes Response body size by route and method.',
+        '# TYPE http_response_size_bytes histogram',
+        *histogram_lines('http_response_size_bytes', data['response_size'], SIZE_BUCKETS),
+    ]
+
+    return '\n'.join(lines) + '\n'
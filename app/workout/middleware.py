@@ -0,0 +1,102 @@
+import time
+
+from django.db import connection
+
+from workout.metrics import registry
+from workout.sqllog import SlowQueryLogger
+from workout.profiling import RequestProfile, profiling_requested, profiling_user
+
+
+def route_name(request):
+    """
+    Url name of resolved view, keeps label cardinality low unlike the path
+    """
+    match = request.resolver_match
+    return (match.view_name or match.route) if match else 'unmatched'
+
+
+class SQLTimer:
+    """
+    Database execute wrapper counting queries and their total time
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, SQL queries and time, response size and status
+    code of every request per route in workout.metrics registry
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = SQLTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        seconds = time.perf_counter() - start
+
+        route = route_name(request)
+        size = None if response.streaming else len(response.content)
+
+        registry.observe(
+            route, request.method, response.status_code,
+            seconds, timer.count, timer.seconds, size
+        )
+        registry.flush()
+
+        return response
+
+
+class SlowQueryLogMiddleware:
+    """
+    Log slow and sampled SQL queries of every request
+    with the view that ran them, see workout.sqllog
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with connection.execute_wrapper(SlowQueryLogger(lambda: route_name(request))):
+            return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests of staff users sending X-Profile header or
+    ?profile=1, see workout.profiling. Other requests only pay
+    for checking the header and query string
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling_requested(request):
+            return self.get_response(request)
+
+        user = profiling_user(request)
+        if user is None or not user.is_staff:
+            return self.get_response(request)
+
+        profile = RequestProfile(SQLTimer())
+        response = profile.run(self.get_response, request)
+        name = profile.save(route_name(request))
+        for header, value in profile.headers(name).items():
+            response[header] = value
+
+        return response
@@ -0,0 +1,88 @@
+import cProfile
+import os
+import re
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+
+
+def profiling_requested(request):
+    """
+    Cheap check of opt in header or ?profile=1, done for every request
+    """
+    if request.META.get(PROFILE_HEADER):
+        return True
+    # avoid parsing query string of requests not mentioning the parameter
+    return (PROFILE_PARAM in request.META.get('QUERY_STRING', '')
+            and request.GET.get(PROFILE_PARAM) not in (None, '', '0'))
+
+
+def profiling_user(request):
+    """
+    User of session or of API credentials, authenticated before the
+    view runs so that requests of other users are never profiled
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    try:
+        return Request(request, authenticators=authenticators).user
+    except APIException:
+        return None
+
+
+class RequestProfile:
+    """
+    Run request under cProfile timing its SQL queries separately
+    with sql execute wrapper, stats are written to settings.PROFILE_DIR
+    """
+
+    def __init__(self, sql):
+        self.profiler = cProfile.Profile()
+        self.sql = sql
+        self.seconds = 0
+
+    def run(self, get_response, request):
+        start = time.perf_counter()
+        with connection.execute_wrapper(self.sql):
+            self.profiler.enable()
+            try:
+                return get_response(request)
+            finally:
+                self.profiler.disable()
+                self.seconds = time.perf_counter() - start
+
+    def save(self, route):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        name = '{}-{}-{}.prof'.format(
+            time.strftime('%Y%m%d%H%M%S'),
+            re.sub(r'[^\w.-]', '-', route),
+            os.getpid()
+        )
+        self.profiler.dump_stats(os.path.join(settings.PROFILE_DIR, name))
+        return name
+
+    def headers(self, name):
+        """
+        Summary of total, SQL and Python time in milliseconds
+        """
+        python = self.seconds - self.sql.seconds
+        return {
+            'Server-Timing': ', '.join((
+                f'total;dur={self.seconds * 1000:.1f}',
+                f'sql;dur={self.sql.seconds * 1000:.1f}',
+                f'python;dur={python * 1000:.1f}',
+            )),
+            'X-Profile': f'file={name}; queries={self.sql.count}',
+        }
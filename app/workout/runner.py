@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner failing requests that go over their query budget
+    and keeping sampled queries out of test output. Auth throttling
+    is turned off as every test client shares one address
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_RAISE = True
+        settings.SQL_LOG_SAMPLE_RATE = 0
+        settings.AUTH_THROTTLE_RATES = {}
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.1/ref/settings/
 
 from pathlib import Path
 import datetime
+import tempfile
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,6 +51,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'workout.middleware.RequestMetricsMiddleware',
+    'workout.middleware.SlowQueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'workout.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'workout.urls'
@@ -77,12 +81,36 @@ TEMPLATES = [
     },
 ]
 
+# "token" makes LoginView return database token,
+# "jwt" returns access and refresh tokens verified by signature alone
+API_AUTH_TOKEN_TYPE = config('API_AUTH_TOKEN_TYPE', default='token')
+
+# database tokens are always accepted, access tokens only in "jwt" mode
+API_AUTHENTICATION_CLASSES = ('user.authentication.CachedTokenAuthentication',)
+if API_AUTH_TOKEN_TYPE == 'jwt':
+    API_AUTHENTICATION_CLASSES += ('user.authentication.StatelessJWTAuthentication',)
+
 REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
-    )
+    'DEFAULT_AUTHENTICATION_CLASSES': API_AUTHENTICATION_CLASSES,
+    # reverse proxies in front of the app appending to X-Forwarded-For,
+    # with 0 client address is REMOTE_ADDR and the header is ignored
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
+# in process cache of token -> user used by CachedTokenAuthentication
+TOKEN_CACHE_TTL = config('TOKEN_CACHE_TTL', default=60, cast=int)
+TOKEN_CACHE_SIZE = config('TOKEN_CACHE_SIZE', default=10000, cast=int)
+
+# token buckets of login, registration and password reset per client
+# address and email as "capacity/period", kept in default cache and in
+# process buckets of AUTH_THROTTLE_LOCAL_SIZE when cache is unavailable
+AUTH_THROTTLE_RATES = {
+    'login': {'ip': '30/min', 'email': '5/min'},
+    'register': {'ip': '10/hour', 'email': '3/hour'},
+    'password_reset': {'ip': '10/hour', 'email': '3/hour'},
+}
+AUTH_THROTTLE_LOCAL_SIZE = config('AUTH_THROTTLE_LOCAL_SIZE', default=10000, cast=int)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': datetime.timedelta(minutes=10),
     'REFRESH_TOKEN_LIFETIME': datetime.timedelta(days=1),
@@ -102,6 +130,64 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+# training response cache relies on a cache shared by all worker processes,
+# local memory cache is only suitable for a single process
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# requests over query budget of their view are logged,
+# test runner makes them raise QueryBudgetExceeded
+QUERY_BUDGET_RAISE = config('QUERY_BUDGET_RAISE', default=False, cast=bool)
+TEST_RUNNER = 'workout.runner.TestRunner'
+
+# every worker process writes its request metrics to a file in METRICS_DIR
+# at most every METRICS_FLUSH_INTERVAL seconds, /metrics sums the files
+# and folds those of stopped processes into one. The directory should be
+# emptied when the application is deployed
+METRICS_DIR = config('METRICS_DIR', default=str(Path(tempfile.gettempdir()) / 'workout-metrics'))
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=float)
+# bearer token required by /metrics, which is disabled while it is empty
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# queries slower than SLOW_QUERY_THRESHOLD seconds are logged as warnings
+# and SQL_LOG_SAMPLE_RATE fraction of all queries as info by workout.sqllog logger
+SLOW_QUERY_THRESHOLD = config('SLOW_QUERY_THRESHOLD', default=0.2, cast=float)
+SQL_LOG_SAMPLE_RATE = config('SQL_LOG_SAMPLE_RATE', default=0.001, cast=float)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'workout.sqllog': {
+            'handlers': ['console'],
+            'level': config('SQL_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# cProfile stats of requests profiled for staff users
+PROFILE_DIR = config('PROFILE_DIR', default=str(Path(tempfile.gettempdir()) / 'workout-profiles'))
+
+TRAINING_CACHE_TIMEOUT = config('TRAINING_CACHE_TIMEOUT', default=300, cast=int)
+
+# max-age of exercise and muscle group catalog responses,
+# clients revalidate with ETag that changes with catalog version
+CATALOG_CACHE_MAX_AGE = config('CATALOG_CACHE_MAX_AGE', default=86400, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -149,3 +235,12 @@ EMAIL_PORT = config('EMAIL_PORT', cast=int)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST = config('EMAIL_HOST')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='localhost')
+
+# outbound email queue drained by send_queued_emails command
+EMAIL_QUEUE_BATCH_SIZE = config('EMAIL_QUEUE_BATCH_SIZE', default=50, cast=int)
+EMAIL_QUEUE_MAX_ATTEMPTS = config('EMAIL_QUEUE_MAX_ATTEMPTS', default=5, cast=int)
+# seconds before first retry, doubled after every failed attempt
+EMAIL_QUEUE_RETRY_DELAY = config('EMAIL_QUEUE_RETRY_DELAY', default=60, cast=int)
+# seconds emails claimed by a worker stay hidden from other workers,
+# emails of a worker that stopped while sending are retried afterwards
+EMAIL_QUEUE_LEASE = config('EMAIL_QUEUE_LEASE', default=300, cast=int)
@@ -0,0 +1,102 @@
+import functools
+import logging
+import random
+import re
+import sys
+import time
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# order matters, literals are replaced before their lists are collapsed
+NORMALIZE_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?(?![\w"])'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r'\((?:\?, )+\?\)'), '(...)'),
+    (re.compile(r'(?:\(\.\.\.\), )+\(\.\.\.\)'), '(...)'),
+)
+
+# leading arguments of execute wrapper functions and methods,
+# their frames sit between the query and the code running it
+EXECUTE_WRAPPER_ARGUMENTS = (
+    ('execute', 'sql', 'params'),
+    ('self', 'execute', 'sql'),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize(sql):
+    """
+    SQL with parameters, literals and IN / VALUES lists replaced so that
+    queries differing only by their values read the same
+    """
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def stack_location():
+    """
+    Innermost frame of project code, outside installed packages
+    and execute wrappers, as "path:line in function"
+    """
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        if (filename.startswith(base_dir) and 'site-packages' not in filename
+                and filename != __file__
+                and code.co_varnames[:3] not in EXECUTE_WRAPPER_ARGUMENTS):
+            path = filename[len(base_dir):].lstrip('/\\')
+            return f'{path}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return 'unknown'
+
+
+class SlowQueryLogger:
+    """
+    Database execute wrapper logging queries slower than
+    settings.SLOW_QUERY_THRESHOLD seconds, and a random
+    settings.SQL_LOG_SAMPLE_RATE fraction of all queries, with
+    the view that ran them. Normalizing SQL and walking the stack
+    only happens for queries that are logged
+    """
+
+    def __init__(self, view):
+        # view is called only when a query is logged, as url
+        # resolution happens after the wrapper is installed
+        self.view = view
+        self.threshold = settings.SLOW_QUERY_THRESHOLD
+        self.sample_rate = settings.SQL_LOG_SAMPLE_RATE
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            seconds = time.perf_counter() - start
+            if self.threshold is not None and seconds >= self.threshold:
+                self.log(logging.WARNING, 'slow query', sql, seconds)
+            elif self.sample_rate and random.random() < self.sample_rate:
+                self.log(logging.INFO, 'sampled query', sql, seconds)
+
+    def log(self, level, message, sql, seconds):
+        view = self.view()
+        location = stack_location()
+        statement = normalize(sql)
+        logger.log(
+            level,
+            f'{message} {seconds * 1000:.1f}ms {view} {location}: {statement}',
+            extra={
+                'sql': statement,
+                'duration': seconds,
+                'view': view,
+                'location': location,
+            }
+        )
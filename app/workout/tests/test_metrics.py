@@ -0,0 +1,171 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from workout.metrics import (registry, collect, empty_metrics, observe_histogram,
+                             LATENCY_BUCKETS, STOPPED_FILE)
+
+
+class TestBaseMetrics:
+    """
+    Base class recording request metrics into temporary directory
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(METRICS_DIR=self.directory, METRICS_TOKEN='secret')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        registry.reset()
+        self.client = APIClient()
+
+    def get_metrics(self, **extra):
+        extra.setdefault('HTTP_AUTHORIZATION', 'Bearer secret')
+        response = self.client.get(reverse('metrics'), **extra)
+        return response, response.content.decode()
+
+
+class TestRequestMetrics(TestBaseMetrics, TestCase):
+    """
+    Test requests are recorded per route
+    """
+
+    def test_should_count_requests_by_route_and_status(self):
+        self.client.get(reverse('training:exercise-list'))
+        self.client.get(reverse('training:exercise-list'))
+        self.client.get(reverse('training:workout-list'))
+
+        response, metrics = self.get_metrics()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('text/plain', response['Content-Type'])
+        self.assertIn(
+            'http_requests_total{route="training:exercise-list",method="GET",status="200"} 2',
+            metrics
+        )
+        self.assertIn(
+            'http_requests_total{route="training:workout-list",method="GET",status="401"} 1',
+            metrics
+        )
+
+    def test_should_record_latency_and_size_histograms(self):
+        self.client.get(reverse('training:exercise-list'))
+
+        response, metrics = self.get_metrics()
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="training:exercise-list",method="GET",le="+Inf"} 1',
+            metrics
+        )
+        self.assertIn(
+            'http_response_size_bytes_count{route="training:exercise-list",method="GET"} 1',
+            metrics
+        )
+        self.assertIn('http_request_sql_queries_total{route="training:exercise-list",method="GET"}', metrics)
+
+    def test_should_label_unmatched_routes(self):
+        self.client.get('/missing/')
+        response, metrics = self.get_metrics()
+        self.assertIn('route="unmatched",method="GET",status="404"', metrics)
+
+
+class TestMetricsAggregation(TestBaseMetrics, TestCase):
+    """
+    Test metrics endpoint sums files of all worker processes
+    """
+
+    def write_other(self, name, requests=5):
+        other = empty_metrics()
+        other['requests']['training:exercise-list|GET|200'] = requests
+        other['latency']['training:exercise-list|GET'] = {
+            'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0, 'count': 0
+        }
+        observe_histogram(other['latency']['training:exercise-list|GET'], LATENCY_BUCKETS, 0.02)
+        with open(os.path.join(self.directory, name), 'w') as metrics_file:
+            json.dump(other, metrics_file)
+
+    def stopped_pid(self):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        return process.pid
+
+    def test_should_sum_metrics_of_other_processes(self):
+        self.write_other(f'{os.getpid()}-other.json')
+
+        self.client.get(reverse('training:exercise-list'))
+        response, metrics = self.get_metrics()
+        self.assertIn(
+            'http_requests_total{route="training:exercise-list",method="GET",status="200"} 6',
+            metrics
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{route="training:exercise-list",method="GET"} 2',
+            metrics
+        )
+
+    def test_should_not_overwrite_file_of_process_with_same_pid(self):
+        # written by a stopped process before its pid was reused
+        self.write_other(f'{os.getpid()}.json')
+        self.client.get(reverse('training:exercise-list'))
+        response, metrics = self.get_metrics()
+        self.assertIn(
+            'http_requests_total{route="training:exercise-list",method="GET",status="200"} 6',
+            metrics
+        )
+
+    def test_should_fold_files_of_stopped_processes(self):
+        pid = self.stopped_pid()
+        self.write_other(f'{pid}-first.json', requests=2)
+        self.write_other(f'{pid}-second.json', requests=3)
+
+        for _ in range(2):
+            response, metrics = self.get_metrics()
+            self.assertIn(
+                'http_requests_total{route="training:exercise-list",method="GET",status="200"} 5',
+                metrics
+            )
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.directory) if name.startswith(str(pid))),
+            []
+        )
+
+    def test_should_not_count_folded_file_twice(self):
+        # fold interrupted after stopped metrics were written
+        pid = self.stopped_pid()
+        self.write_other(f'{pid}-first.json', requests=2)
+        collect()
+        self.write_other(f'{pid}-first.json', requests=2)
+        with open(os.path.join(self.directory, STOPPED_FILE)) as stopped_file:
+            self.assertEqual(json.load(stopped_file)['merged'], [f'{pid}-first.json'])
+
+        response, metrics = self.get_metrics()
+        self.assertIn(
+            'http_requests_total{route="training:exercise-list",method="GET",status="200"} 2',
+            metrics
+        )
+
+
+class TestMetricsToken(TestBaseMetrics, TestCase):
+    """
+    Test metrics endpoint requires token
+    """
+
+    def test_should_require_token(self):
+        response, metrics = self.get_metrics(HTTP_AUTHORIZATION='')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response, metrics = self.get_metrics(HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_should_refuse_without_configured_token(self):
+        response, metrics = self.get_metrics(HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,90 @@
+import os
+import pstats
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+
+USER = get_user_model()
+
+
+class TestBaseProfiling:
+    """
+    Base class requesting training endpoint with profiling asked for
+    """
+    is_staff = True
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(PROFILE_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user = USER.objects.create(
+                    email='staff@email.com',
+                    username='staff',
+                    password='testpassword',
+                    is_verified=True,
+                    is_staff=self.is_staff,
+        )
+        token = Token.objects.create(user=user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+
+class TestStaffProfiling(TestBaseProfiling, TestCase):
+    """
+    Test requests of staff users are profiled on demand
+    """
+
+    def test_should_profile_request_with_header(self):
+        response = self.client.get(reverse('training:workout-list'), HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        timing = dict(
+            metric.split(';dur=') for metric in response['Server-Timing'].split(', ')
+        )
+        self.assertEqual(set(timing), {'total', 'sql', 'python'})
+        self.assertAlmostEqual(
+            float(timing['total']), float(timing['sql']) + float(timing['python']), delta=0.2
+        )
+
+        name = response['X-Profile'].split(';')[0][len('file='):]
+        self.assertIn('training-workout-list', name)
+        stats = pstats.Stats(os.path.join(self.directory, name))
+        self.assertTrue(stats.total_calls)
+
+    def test_should_profile_request_with_query_parameter(self):
+        response = self.client.get(reverse('training:workout-list'), {'profile': '1'})
+        self.assertIn('X-Profile', response)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_should_not_profile_without_asking(self):
+        with mock.patch('workout.middleware.profiling_user') as profiling_user:
+            response = self.client.get(reverse('training:workout-list'), {'profile': '0'})
+        profiling_user.assert_not_called()
+        self.assertNotIn('X-Profile', response)
+        self.assertFalse(os.listdir(self.directory))
+
+
+class TestUserProfiling(TestBaseProfiling, TestCase):
+    """
+    Test requests of other users are never profiled
+    """
+    is_staff = False
+
+    def test_should_not_profile_request(self):
+        response = self.client.get(reverse('training:workout-list'), HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Profile', response)
+        self.assertNotIn('Server-Timing', response)
+        self.assertFalse(os.listdir(self.directory))
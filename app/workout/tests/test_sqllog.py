@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from workout.sqllog import normalize, logger
+
+
+class TestNormalize(TestCase):
+    """
+    Test queries differing only by values normalize the same
+    """
+
+    def test_should_replace_parameters_and_literals(self):
+        self.assertEqual(
+            normalize('SELECT "t1"."id" FROM "t1"\n  WHERE "t1"."name" = \'it\'\'s\' AND "t1"."id" > 10 LIMIT %s'),
+            'SELECT "t1"."id" FROM "t1" WHERE "t1"."name" = ? AND "t1"."id" > ? LIMIT ?'
+        )
+
+    def test_should_collapse_in_lists(self):
+        self.assertEqual(
+            normalize('SELECT * FROM "set" WHERE "set"."id" IN (%s, %s, %s)'),
+            normalize('SELECT * FROM "set" WHERE "set"."id" IN (%s, %s)'),
+        )
+
+    def test_should_collapse_inserted_rows(self):
+        self.assertEqual(
+            normalize('INSERT INTO "set" ("reps", "weight") VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO "set" ("reps", "weight") VALUES (...)'
+        )
+
+
+class TestSlowQueryLog(TestCase):
+    """
+    Test slow and sampled queries are logged with their view
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+
+    @override_settings(SLOW_QUERY_THRESHOLD=0)
+    def test_should_log_slow_queries_with_view_and_location(self):
+        with self.assertLogs(logger, 'WARNING') as logs:
+            self.client.get(reverse('training:workout-list'), HTTP_AUTHORIZATION='Token missing')
+
+        record = logs.records[0]
+        self.assertEqual(record.view, 'training:workout-list')
+        self.assertTrue(record.location.startswith('user/'), record.location)
+        self.assertIn('?', record.sql)
+        self.assertIn('slow query', record.getMessage())
+
+    @override_settings(SLOW_QUERY_THRESHOLD=60, SQL_LOG_SAMPLE_RATE=1)
+    def test_should_log_sampled_queries(self):
+        with self.assertLogs(logger, 'INFO') as logs:
+            self.client.get(reverse('training:workout-list'), HTTP_AUTHORIZATION='Token missing')
+        self.assertTrue(all(record.levelname == 'INFO' for record in logs.records))
+
+    @override_settings(SLOW_QUERY_THRESHOLD=60, SQL_LOG_SAMPLE_RATE=0)
+    def test_should_not_log_fast_queries(self):
+        with mock.patch.object(logger, 'log') as log:
+            self.client.get(reverse('training:workout-list'), HTTP_AUTHORIZATION='Token missing')
+        log.assert_not_called()
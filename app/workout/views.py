@@ -0,0 +1,22 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from workout.metrics import registry, collect, exposition
+
+
+def metrics(request):
+    """
+    Request metrics of all worker processes in Prometheus text format,
+    protected by bearer token settings.METRICS_TOKEN, never served
+    when no token is configured
+    """
+    expected = f'Bearer {settings.METRICS_TOKEN}'
+    if (not settings.METRICS_TOKEN
+            or not hmac.compare_digest(request.headers.get('Authorization', ''), expected)):
+        return HttpResponseForbidden()
+
+    # include requests of this process not written yet
+    registry.flush(force=True)
+    return HttpResponse(exposition(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')